@@ -4,15 +4,38 @@ from __future__ import annotations
 
 import pygame as pg
 
+from models.constants import MAX_FRAME_DT, TYPEWRITER_CPS
 from models.dialog import DialogModel
+from models.preloader import Preloader
+from models.resources import resources
 from views.dialog_view import DialogView
 
+IDLE_WAIT_MS = 500  # сколько спать без событий, когда на экране ничего не меняется
+NARRATION_LOOKAHEAD = 2  # на сколько реплик вперёд декодировать озвучку
+# События окна, после которых кадр нужно показать заново
+_REDRAW_EVENTS = frozenset({
+    pg.VIDEOEXPOSE, pg.VIDEORESIZE, pg.WINDOWEXPOSED, pg.WINDOWSIZECHANGED,
+    pg.WINDOWRESTORED, pg.WINDOWSHOWN,
+})
+
 
 class DialogController:
     """Воспроизводит сюжетные реплики.
 
     Возвращает 'game' по завершении диалога,
     'exit' — если игрок закрыл окно.
+
+    Если в настройках включена печатная машинка (``Config.typewriter``),
+    текст появляется посимвольно: первое нажатие допечатывает реплику,
+    второе листает.  Иначе реплика видна сразу и нажатие листает.
+
+    Кадр рисуется и показывается только когда что-то изменилось: новая
+    реплика, очередной напечатанный символ или событие окна.  Если ничего
+    не происходит, цикл спит в ``pg.event.wait``.
+
+    Озвучка декодируется в фоне для текущей и ``NARRATION_LOOKAHEAD``
+    следующих реплик и играет, как только клип готов; клипы пройденных
+    реплик выгружаются из кэша ресурсов.
     """
 
     def __init__(self, cfg) -> None:
@@ -23,6 +46,16 @@ class DialogController:
         self.view = DialogView(None, self.screen, cfg)
 
         self.current = 0
+        # Фоновая загрузка картинок следующей реплики, пока показывается текущая
+        self._prefetch: Preloader | None = None
+        self._prepared = True  # кадр следующей реплики уже собран
+        self._revealed = 0.0   # сколько символов текущей реплики уже напечатано
+        self._dirty = True     # кадр устарел и его нужно нарисовать
+        self._dt = 0           # длительность прошлого кадра, мс
+        # Фоновое декодирование озвучки и клип, который ждёт, чтобы заиграть
+        self._narration: Preloader | None = None
+        self._pending_sound: str | None = None
+        self._narrated: list[str] = []  # клипы текущего окна озвучки (могут быть в кэше)
 
     # ---------------------------------------------------------------- run
     def run(self) -> str | None:
@@ -34,35 +67,133 @@ class DialogController:
         self.current = 0
         pg.mixer.music.stop()
         self._play_sound_if_any()
+        self._prefetch_next()
+        self._revealed = 0.0
+        self._dirty = True
+        self._dt = 0
+        self.clock.tick()  # время до входа в сцену не считается временем печати
 
         while True:
-            for event in pg.event.get():
+            events = pg.event.get()
+            if not events and self._idle():
+                # Ничего не меняется — спим до события вместо 60 пустых кадров
+                events = [pg.event.wait(IDLE_WAIT_MS)]
+                self.clock.tick()  # сон не считается временем печати следующего кадра
+            for event in events:
+                if event.type in _REDRAW_EVENTS:
+                    self._dirty = True
                 if event.type == pg.QUIT:
+                    self._finish()
                     return "exit"
-                if event.type == pg.KEYDOWN and event.key in (pg.K_SPACE, pg.K_RETURN):
-                    if self.current < len(self.model) - 1:
-                        self.current += 1
-                        self._play_sound_if_any()
-                    else:
-                        pg.mixer.stop()
-                        return "game"
-                if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                    if self.current < len(self.model) - 1:
-                        self.current += 1
-                        self._play_sound_if_any()
-                    else:
+                if (event.type == pg.KEYDOWN and event.key in (pg.K_SPACE, pg.K_RETURN)
+                        or event.type == pg.MOUSEBUTTONDOWN and event.button == 1):
+                    self._dirty = True
+                    if self._revealing():
+                        # Первое нажатие допечатывает реплику, второе — листает
+                        self._revealed = self.view.text_length(self.current)
+                    elif not self._advance():
                         pg.mixer.stop()
+                        self._finish()
                         return "game"
 
-            self.screen.fill((0, 0, 0))
-            self.view.draw(self.current)
-            pg.display.flip()
-            self.clock.tick(60)
+            self._poll_prefetch()
+            self._poll_narration()
+            if self._revealing():
+                shown = int(self._revealed)
+                self._revealed += TYPEWRITER_CPS * self._dt / 1000
+                self._dirty |= int(self._revealed) != shown
+            if self._dirty:
+                self.view.draw(self.current, int(self._revealed) if self._revealing() else None)
+                pg.display.flip()
+                self._dirty = False
+            # Подвисание (перетаскивание окна, долгая сборка кадра) не печатает текст рывком
+            self._dt = min(self.clock.tick(60), int(MAX_FRAME_DT * 1000))
 
     # ----------------------------------------------------------- helpers
+    def _advance(self) -> bool:
+        """Переходит к следующей реплике; False — реплики кончились."""
+        if self.current >= len(self.model) - 1:
+            return False
+        self.current += 1
+        self._revealed = 0.0
+        self._play_sound_if_any()
+        self._prefetch_next()
+        return True
+
+    def _idle(self) -> bool:
+        """Нечего делать без событий: текст напечатан, следующая реплика готова."""
+        return (not self._dirty and self._prepared and not self._revealing()
+                and self._pending_sound is None)
+
+    def _revealing(self) -> bool:
+        """Печатается ли ещё текст текущей реплики."""
+        return (self.cfg.typewriter and TYPEWRITER_CPS > 0
+                and self._revealed < self.view.text_length(self.current))
+
+    def _prefetch_next(self) -> None:
+        """Начинает декодировать картинки следующей реплики в фоне."""
+        self._cancel_prefetch()
+        following = self.current + 1
+        if following < len(self.model):
+            self._prefetch = Preloader(self.view.assets(following), workers=1)
+            self._prepared = False
+        else:
+            self._prepared = True  # последняя реплика — готовить нечего
+
+    def _poll_prefetch(self) -> None:
+        """Забирает готовое в кэш; когда всё готово — собирает кадр следующей реплики."""
+        if self._prefetch is None or self._prepared:
+            return
+        if self._prefetch.poll(budget_ms=4) >= 1.0:
+            self.view.prepare(self.current + 1)
+            self._prepared = True
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch = None
+        self._prepared = True  # ждать больше нечего, иначе _idle() не даст уснуть
+
     def _play_sound_if_any(self) -> None:
         pg.mixer.stop()
-        
-        entry = self.model.get(self.current)
-        if entry.sound:
-            pg.mixer.Sound(entry.sound).play()
+        self._prefetch_narration()
+        # Клип заиграет, как только декодируется (обычно он уже готов заранее)
+        self._pending_sound = self.model.get(self.current).sound
+        self._poll_narration()
+
+    def _prefetch_narration(self) -> None:
+        """Декодирует озвучку текущей и следующих реплик; пройденные клипы выгружает."""
+        if self._narration is not None:
+            self._narration.cancel()
+        ahead = range(self.current, min(self.current + 1 + NARRATION_LOOKAHEAD, len(self.model)))
+        # Порядок важен: клип текущей реплики декодируется первым
+        needed = [sound for sound in dict.fromkeys(self.model.get(i).sound for i in ahead) if sound]
+        self._narration = Preloader(sounds=needed, workers=1)
+        # Окно сдвинулось: выгружаем клипы, которые из него вышли
+        for sound in self._narrated:
+            if sound not in needed:
+                resources.discard_sound(sound)
+        self._narrated = needed
+
+    def _poll_narration(self) -> None:
+        """Принимает декодированные клипы и запускает ожидающий."""
+        if self._narration is not None:
+            self._narration.poll(budget_ms=2)
+        if self._pending_sound is None:
+            return
+        if resources.has_sound(self._pending_sound):
+            resources.sound(self._pending_sound).play()
+            self._pending_sound = None
+        elif self._narration is None or self._narration.finished:
+            self._pending_sound = None  # клип не загрузился (нет файла или микшера)
+
+    def _finish(self) -> None:
+        """Останавливает фоновую загрузку и выгружает озвучку главы."""
+        self._cancel_prefetch()
+        if self._narration is not None:
+            self._narration.cancel()
+            self._narration = None
+        self._pending_sound = None
+        for sound in self._narrated:
+            resources.discard_sound(sound)
+        self._narrated = []
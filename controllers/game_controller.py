@@ -6,6 +6,7 @@ from models.player import Player
 from models.constants import GRAVITY, MAX_FALL_SPEED # Оставляем нужные константы
 from views.game_view import GameView
 from models.level import Level # <--- Импортируем Level
+from models.animation import animation_clock
 
 class GameController(Scene):
     """Платформер-геймплей."""
@@ -46,6 +47,12 @@ class GameController(Scene):
             kb["block"]: self.player.stop_block,
         }
 
+    def run(self) -> str | None:
+        try:
+            return super().run()
+        finally:
+            self.level.close() # Останавливаем фоновую подгрузку чанков уровня
+
     # ---------------------------------------------------------------- events
     def handle_events(self) -> str | None:
         if self.view.screen is not self.config.screen:
@@ -66,8 +73,13 @@ class GameController(Scene):
 
     # ---------------------------------------------------------------- model / draw
     def update_model(self) -> None:
+        # Один замер времени на кадр: общие часы сдвигают все играющие анимации
+        animation_clock.tick(self.clock.get_time())
+
         # Обновляем игрока (анимации, внутреннюю логику)
         self.sprites.update()
+        # Анимированные тайлы идут по тем же часам (пауза и slow-motion действуют и на них)
+        self.level.update(animation_clock.dt * 1000)
 
         # Применяем гравитацию <--- НОВОЕ
         self._apply_gravity()
@@ -87,34 +99,20 @@ class GameController(Scene):
         # Мы не ставим on_ground здесь, это сделает обработчик коллизий
 
     def _handle_collisions(self):
-        """Обрабатывает коллизии игрока с уровнем."""
+        """Двигает игрока с учётом коллизий уровня (swept AABB по сетке)."""
         player = self.player
-        collidable_tiles = self.level.collidable_tiles
 
         # Горизонтальное движение и коллизии
-        player.rect.x += round(player.vel_x * player.get_speed())
-        hit_list = pg.sprite.spritecollide(player, collidable_tiles, False)
-        for tile in hit_list:
-            if player.vel_x > 0: # Движение вправо
-                player.rect.right = tile.rect.left
-            elif player.vel_x < 0: # Движение влево
-                player.rect.left = tile.rect.right
+        self.level.move_rect(player.rect, round(player.vel_x * player.get_speed()), 0)
         player.vel_x = 0 # Сбрасываем vel_x после проверки, так как set_move_* его установит
         player._recalc_vel_x() # Пересчитываем на основе нажатых клавиш
 
-
         # Вертикальное движение и коллизии
-        player.rect.y += round(player.vel_y)
-        hit_list = pg.sprite.spritecollide(player, collidable_tiles, False)
-        player.on_ground = False # Считаем, что игрок в воздухе, пока не найдем опору
-        for tile in hit_list:
-            if player.vel_y > 0: # Движение вниз
-                player.rect.bottom = tile.rect.top
-                player.vel_y = 0
-                player.on_ground = True # Нашли опору
-            elif player.vel_y < 0: # Движение вверх
-                player.rect.top = tile.rect.bottom
-                player.vel_y = 0
+        dy = round(player.vel_y)
+        _, hit_y = self.level.move_rect(player.rect, 0, dy)
+        player.on_ground = hit_y and dy > 0 # Упёрлись при движении вниз — нашли опору
+        if hit_y:
+            player.vel_y = 0
 
     def draw(self) -> None:
         self.view.update(self.player)
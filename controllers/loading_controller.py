@@ -0,0 +1,41 @@
+"""Контроллер экрана загрузки."""
+from __future__ import annotations
+
+import pygame as pg
+
+from controllers.scene_base import Scene
+from models.preloader import Preloader
+from views.loading_view import LoadingView
+
+
+class LoadingController(Scene):
+    """Показывает прогресс, пока Preloader декодирует ресурсы в фоне.
+
+    Возвращает ``next_action`` после загрузки, 'exit' — если окно закрыли.
+    """
+
+    def __init__(self, config, preloader: Preloader, next_action: str):
+        super().__init__(config)
+        self.preloader = preloader
+        self.next_action = next_action
+        self.view = LoadingView(self.config.screen)
+
+    # ---------------------------------------------------------------- events
+    def handle_events(self) -> str | None:
+        if self.view.screen is not self.config.screen:
+            self.view.update_screen(self.config.screen)
+
+        for ev in pg.event.get():
+            if ev.type == pg.QUIT:
+                self.preloader.cancel()
+                return "exit"
+        if self.preloader.finished:
+            return self.next_action
+        return None
+
+    # ---------------------------------------------------------------- model / draw
+    def update_model(self) -> None:
+        self.preloader.poll()
+
+    def draw(self) -> None:
+        self.view.draw(self.preloader.progress)
@@ -1,4 +1,4 @@
-"""Менеджер сцен — меню → диалог → настройки → игра."""
+"""Менеджер сцен — (загрузка) → меню → диалог → настройки → игра."""
 from __future__ import annotations
 
 import pygame as pg
@@ -7,7 +7,16 @@ from controllers.menu_controller import MenuController
 from controllers.settings_controller import SettingsController
 from controllers.game_controller import GameController
 from controllers.dialog_controller import DialogController
+from controllers.loading_controller import LoadingController
+from models.asset_pack import chapter_pack_path, packs
 from models.dialog import DialogModel
+from models.player import Player
+from models.preloader import Preloader
+from views.dialog_view import DEFAULT_PORTRAIT
+from views.hud import HUD_IMAGES
+from views.menu_view import BG_IMAGES
+
+DIALOG_PRELOAD_ENTRIES = 2  # картинки скольких первых реплик грузить до начала диалога
 
 
 class SceneManager:
@@ -17,6 +26,7 @@ class SceneManager:
         self.cfg = config
         self._menu_cache: MenuController | None = None   # сохраняем фон/музыку
         self.current_level_id: str = "level_0" # <--- Храним ID текущего уровня
+        self._mounted = None  # путь подключённого пакета главы
 
     # ---------------------------------------------------------------- run
     def run(self) -> None:
@@ -26,17 +36,26 @@ class SceneManager:
         while True:
             # -------- создаём/берём нужный контроллер --------------------
             if current == "menu":
+                # Фоны меню декодируем параллельно, пока крутится экран загрузки
+                if not self._menu_cache and not self._preload([(path, False) for path in BG_IMAGES]):
+                    break
                 self._menu_cache = self._menu_cache or MenuController(self.cfg)
                 controller = self._menu_cache
             elif current == "dialog":
+                self._mount_chapter()
                 # <--- Загружаем модель диалога для текущего уровня ---
                 dialog_model = DialogModel(f"assets/chapters/{self.current_level_id}/")
+                if not self._preload(*self._dialog_assets(dialog_model)):
+                    break
                 controller = DialogController(self.cfg)
                 controller.model = dialog_model # <--- Передаем модель в контроллер
             elif current == "settings":
                 controller = SettingsController(self.cfg)
             elif current == "game":
                 pg.mixer.music.stop()
+                self._mount_chapter()
+                if not self._preload(self._game_assets()):
+                    break
                 # <--- Передаем current_level_id в GameController ---
                 controller = GameController(self.cfg, saved=saved, level_id=self.current_level_id)
             else:
@@ -70,6 +89,42 @@ class SceneManager:
             #     current = "game"; continue
 
     # ------------------------------------------------------------- helpers
+    def _mount_chapter(self) -> None:
+        """Подключает пакет текущей главы (если собран), отключая прежние."""
+        pack_path = chapter_pack_path(self.current_level_id)
+        if self._mounted != pack_path:
+            packs.unmount_all()
+            self._mounted = pack_path if packs.mount(pack_path) else None
+
+    def _preload(self, images=(), sounds=()) -> bool:
+        """Декодирует ресурсы в фоне, показывая экран загрузки.
+
+        Возвращает False, если окно закрыли во время загрузки.
+        """
+        preloader = Preloader(images, sounds)
+        if preloader.finished:
+            return True  # всё уже в кэше — экран загрузки не нужен
+        return LoadingController(self.cfg, preloader, "loaded").run() == "loaded"
+
+    @staticmethod
+    def _dialog_assets(model: DialogModel) -> tuple[list[tuple[str, bool]], list[str]]:
+        """Картинки и портреты первых реплик главы и озвучка первой.
+
+        Сценарий может быть длинным, поэтому остальное DialogController
+        декодирует в фоне по ходу диалога.
+        """
+        images = [(DEFAULT_PORTRAIT, True)]
+        for i in range(min(DIALOG_PRELOAD_ENTRIES, len(model))):
+            entry = model.get(i)
+            images += [(path, True) for path in (entry.image, entry.portrait) if path]
+        sounds = [model.get(0).sound] if len(model) and model.get(0).sound else []
+        return images, sounds
+
+    @staticmethod
+    def _game_assets() -> list[tuple[str, bool]]:
+        """Кадры игрока и картинки HUD."""
+        return [(str(path), True) for path in [*Player.asset_paths(), *HUD_IMAGES.values()]]
+
     @staticmethod
     def _load_save() -> tuple[int, int, int] | None:
         try:
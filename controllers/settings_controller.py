@@ -4,6 +4,7 @@ from __future__ import annotations
 import pygame as pg
 
 from controllers.scene_base import Scene
+from models.display_format import display_format
 from views.settings_view import SettingsView
 
 ALLOWED_FPS = [30, 60, 90, 120, 144, 165, 180, 200, 240]
@@ -18,6 +19,7 @@ OPTIONS = [
     ("FPS Limit",     "fps",    "slider"),
     ("Screen Mode",   "screen", "toggle"),
     ("Music Volume",  "volume", "slider"),
+    ("Typewriter",    "typewriter", "toggle"),
     ("Back",          "back",   "action"),
 ]
 
@@ -97,8 +99,11 @@ class SettingsController(Scene):
                 self.config.screen = pg.display.set_mode((960, 540), pg.RESIZABLE)
                 
             pg.display.set_caption("Fallen Knight")
+            display_format.mode_changed() # Старые поверхности могли устареть по формату
         elif ident == "volume":
             self.config.music_volume = 0.0 if self.config.music_volume >= 0.9 else round(self.config.music_volume + 0.1, 1)
+        elif ident == "typewriter":
+            self.config.typewriter = not self.config.typewriter
         elif ident == "back":
             return "back"
         
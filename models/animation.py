@@ -1,38 +1,173 @@
-"""Анимация спрайта."""
+"""Анимация спрайта и общие часы анимаций."""
 from __future__ import annotations
 
+import weakref
+
 import pygame as pg
 
+from models.constants import MAX_FRAME_DT
+from models.display_format import display_format, reconvert
+
+
+class AnimationClock:
+    """Одни часы на все анимации: время читается один раз за кадр.
+
+    Сцена вызывает ``tick`` раз в кадр, и все играющие анимации сдвигаются
+    на общий ``dt``.  ``time_scale`` замедляет/ускоряет время (slow-motion),
+    ``paused`` останавливает его, ``hit_stop`` замораживает на короткий срок.
+    """
+
+    def __init__(self) -> None:
+        self.time_scale = 1.0
+        self.paused = False
+        self.dt = 0.0       # игровое время прошлого кадра, сек (с учётом паузы и масштаба)
+        self.real_dt = 0.0  # реальное время прошлого кадра, сек
+        self._freeze = 0.0  # сколько ещё длится hit-stop, сек реального времени
+        # Только играющие анимации: остановленные часы не трогают
+        self._playing: weakref.WeakSet[Animation] = weakref.WeakSet()
+
+    def tick(self, dt_ms: float) -> float:
+        """Продвигает часы на время кадра (мс, например ``Clock.get_time()``).
+
+        Возвращает игровой dt в секундах.
+        """
+        # Длинный кадр (загрузка, перетаскивание окна) не проматывает анимации
+        self.real_dt = min(dt_ms / 1000, MAX_FRAME_DT)
+        if self.paused:
+            self.dt = 0.0
+        else:
+            # hit-stop съедает часть кадра, остаток идёт в игровое время
+            frozen = min(self._freeze, self.real_dt)
+            self._freeze -= frozen
+            self.dt = (self.real_dt - frozen) * self.time_scale
+        if self.dt:
+            for animation in list(self._playing):
+                animation.advance(self.dt)
+        return self.dt
+
+    def hit_stop(self, seconds: float) -> None:
+        """Замораживает игровое время на ``seconds`` реального времени."""
+        self._freeze = max(self._freeze, seconds)
+
+    # ------------------------------------------------ регистрация анимаций
+    def add(self, animation: Animation) -> None:
+        self._playing.add(animation)
+
+    def discard(self, animation: Animation) -> None:
+        self._playing.discard(animation)
+
+
+# Общие часы игры
+animation_clock = AnimationClock()
+
 
 class Animation:
-    """Зацикленные/одноразовые последовательности кадров."""
+    """Зацикленные/одноразовые последовательности кадров.
+
+    Кадры обрезаются до непрозрачной области (``trim``): рисуется только
+    видимая часть, а её сдвиг от левого верхнего угла полного кадра
+    отдаёт ``offset``.  С ``masks=True`` для каждого кадра (и для
+    отражённых по X) заранее строится маска коллизий — ``mask``.
+    """
 
-    def __init__(self, frames: list[pg.Surface], fps: int, *, loop: bool = True):
-        self.frames, self.fps, self.loop = frames, fps, loop
-        self.idx, self.playing, self.last = 0, False, 0
+    def __init__(self, frames: list[pg.Surface], fps: int, *, loop: bool = True,
+                 clock: AnimationClock = animation_clock, trim: bool = True, masks: bool = False):
+        self.fps, self.loop = fps, loop
+        self.idx, self.playing = 0, False
+        self.frame_time = 1 / fps  # длительность кадра, сек
+        self._elapsed = 0.0        # сколько показывается текущий кадр
+        self._clock = clock
+        # Размер полного кадра: от него считаются сдвиги отражённых кадров
+        self.frame_size = frames[0].get_size() if frames else (0, 0)
+        if trim:
+            bounds = [frame.get_bounding_rect() for frame in frames]
+            frames = [frame.subsurface(rect) for frame, rect in zip(frames, bounds)]
+            offsets = [rect.topleft for rect in bounds]
+        else:
+            offsets = [(0, 0)] * len(frames)
+        self.frames = frames
+        # Отражённые наборы кадров и сдвигов: (flip_x, flip_y) -> ...; строятся один раз
+        self._flipped: dict[tuple[bool, bool], list[pg.Surface]] = {(False, False): frames}
+        self._offsets: dict[tuple[bool, bool], list[tuple[int, int]]] = {(False, False): offsets}
+        # Маски кадров по отражениям; совпадают с обрезанными кадрами и их offset
+        self._masks: dict[tuple[bool, bool], list[pg.mask.Mask]] = {}
+        if masks:
+            # Персонаж смотрит в обе стороны — готовим обе маски при загрузке
+            self._frame_masks(False, False)
+            self._frame_masks(True, False)
+        display_format.listen(self.reconvert)
 
     def start(self) -> None:
-        self.idx, self.playing, self.last = 0, True, pg.time.get_ticks()
+        self.idx, self.playing, self._elapsed = 0, True, 0.0
+        self._clock.add(self)
 
     def stop(self) -> None:
         self.playing = False
+        self._clock.discard(self)
 
     def update(self, *, flip_x=False, flip_y=False) -> pg.Surface:
-        self._advance()
-        frame = self.frames[self.idx]
-        return pg.transform.flip(frame, flip_x, flip_y) if (flip_x or flip_y) else frame
+        """Текущий кадр; кадры сдвигают общие часы (``AnimationClock.tick``)."""
+        return self._frames(bool(flip_x), bool(flip_y))[self.idx]
 
-    # ---------------------------------------------------------------------
-    def _advance(self) -> None:
+    def offset(self, *, flip_x=False, flip_y=False) -> tuple[int, int]:
+        """Сдвиг текущего (обрезанного) кадра внутри полного кадра."""
+        return self._frame_offsets(bool(flip_x), bool(flip_y))[self.idx]
+
+    def mask(self, *, flip_x=False, flip_y=False) -> pg.mask.Mask:
+        """Маска текущего кадра (положение — как у кадра, см. ``offset``)."""
+        return self._frame_masks(bool(flip_x), bool(flip_y))[self.idx]
+
+    def reconvert(self) -> None:
+        """Переводит кадры в формат нового окна; маски и сдвиги остаются прежними."""
+        self._flipped = {
+            flip: [reconvert(frame) for frame in frames] for flip, frames in self._flipped.items()
+        }
+        self.frames = self._flipped[False, False]
+
+    def advance(self, dt: float) -> None:
+        """Сдвигает анимацию на dt секунд (вызывают часы)."""
         if not self.playing:
             return
-        if pg.time.get_ticks() - self.last >= 1000 // self.fps:
+        self._elapsed += dt
+        # Допуск на накопленную ошибку float: 60 кадров по 1/60 с — ровно секунда
+        while self._elapsed >= self.frame_time - 1e-9:
+            self._elapsed -= self.frame_time
             self.idx += 1
             if self.idx >= len(self.frames):
                 self.idx = 0
                 if not self.loop:
-                    self.playing = False
-            self.last = pg.time.get_ticks()
+                    self.stop()
+                    return
+
+    # ---------------------------------------------------------------------
+    def _frames(self, flip_x: bool, flip_y: bool) -> list[pg.Surface]:
+        """Кадры с нужным отражением; при первом запросе отражаем весь набор."""
+        frames = self._flipped.get((flip_x, flip_y))
+        if frames is None:
+            frames = [pg.transform.flip(frame, flip_x, flip_y) for frame in self.frames]
+            self._flipped[flip_x, flip_y] = frames
+        return frames
+
+    def _frame_offsets(self, flip_x: bool, flip_y: bool) -> list[tuple[int, int]]:
+        """Сдвиги кадров с отражением: отражается и положение видимой области."""
+        offsets = self._offsets.get((flip_x, flip_y))
+        if offsets is None:
+            full_w, full_h = self.frame_size
+            offsets = [
+                (full_w - x - frame.get_width() if flip_x else x,
+                 full_h - y - frame.get_height() if flip_y else y)
+                for frame, (x, y) in zip(self.frames, self._offsets[False, False])
+            ]
+            self._offsets[flip_x, flip_y] = offsets
+        return offsets
+
+    def _frame_masks(self, flip_x: bool, flip_y: bool) -> list[pg.mask.Mask]:
+        """Маски кадров с нужным отражением; строятся один раз на набор."""
+        masks = self._masks.get((flip_x, flip_y))
+        if masks is None:
+            masks = [pg.mask.from_surface(frame) for frame in self._frames(flip_x, flip_y)]
+            self._masks[flip_x, flip_y] = masks
+        return masks
 
     # ---------------------------------------------------------------------
     @property
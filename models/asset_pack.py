@@ -0,0 +1,187 @@
+"""Упакованные главы: один файл на главу вместо десятков разрозненных.
+
+``python -m tools.pack_chapter`` собирает всё, что нужно главе (сценарий,
+TMX и его скомпилированный кэш, тайлсеты, сюжетные картинки, озвучку),
+в ``assets/chapters/<level_id>.pak``::
+
+    b"FKPK" | u16 версия | u32 длина оглавления | JSON-оглавление | данные
+
+Оглавление — ``{"files": {логический путь: [смещение, длина, источники]}}``,
+где логический путь — путь от корня проекта (``assets/images/...``), а
+смещение отсчитывается от начала данных.  Файл открывается один раз и
+отображается в память (``mmap``); ``read`` отдаёт срез без копирования.
+
+Источники — ``[путь, размер, mtime_ns]`` файлов, из которых собрана запись.
+Если такой файл лежит рядом и изменился после упаковки, запись считается
+устаревшей и читается сам файл — правки ассетов видны без пересборки.
+
+Модуль не зависит от Pygame (его использует и ``DialogModel``).
+"""
+from __future__ import annotations
+
+import io
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+PACK_SUFFIX = ".pak"
+CHAPTERS_ROOT = Path("assets/chapters")
+_MAGIC = b"FKPK"
+_VERSION = 1
+_HEAD = struct.Struct("<4sHI")
+
+
+def logical_path(path: str | Path) -> str:
+    """Путь от корня проекта в виде ``a/b/c.png`` (``..`` и ``./`` убираются)."""
+    return Path(os.path.relpath(path)).as_posix()
+
+
+def write_pack(pack_path: str | Path, files: dict[str, tuple[Path, list[Path]]]) -> int:
+    """Пишет пакет: логический путь → (файл с данными, его исходники).
+
+    Возвращает размер пакета в байтах.
+    """
+    pack_path = Path(pack_path)
+    toc: dict[str, list] = {}
+    blobs: list[bytes] = []
+    offset = 0
+    for name, (path, sources) in files.items():
+        data = path.read_bytes()
+        stats = [(logical_path(src), src.stat()) for src in sources]
+        toc[name] = [offset, len(data), [[src, st.st_size, st.st_mtime_ns] for src, st in stats]]
+        blobs.append(data)
+        offset += len(data)
+
+    header = json.dumps({"files": toc}, ensure_ascii=False).encode("utf-8")
+    tmp_path = pack_path.with_name(pack_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEAD.pack(_MAGIC, _VERSION, len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, pack_path)
+    return pack_path.stat().st_size
+
+
+def chapter_pack_path(level_id: str) -> Path:
+    """Где лежит пакет главы."""
+    return CHAPTERS_ROOT / f"{level_id}{PACK_SUFFIX}"
+
+
+class AssetPack:
+    """Один пакет: оглавление и отображённые в память данные."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, toc_len = _HEAD.unpack_from(self._map, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"неизвестный формат пакета {self.path}")
+            toc = json.loads(self._map[_HEAD.size:_HEAD.size + toc_len])
+        except (ValueError, KeyError, struct.error):
+            self._map.close()
+            raise
+        self._data_start = _HEAD.size + toc_len
+        self._files: dict[str, list] = toc["files"]
+        self._fresh: dict[str, bool] = {}  # результат проверки источников по записи
+
+    def __contains__(self, name: str) -> bool:
+        """Есть ли свежая запись с таким логическим путём."""
+        entry = self._files.get(name)
+        return entry is not None and self._is_fresh(name, entry[2])
+
+    def names(self) -> list[str]:
+        return list(self._files)
+
+    def read(self, name: str) -> memoryview | None:
+        """Срез данных записи без копирования; None — записи нет или она устарела."""
+        if name not in self:
+            return None
+        entry = self._files[name]
+        start = self._data_start + entry[0]
+        return memoryview(self._map)[start:start + entry[1]]
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # кто-то ещё держит срез — mmap закроется вместе с ним
+
+    def _is_fresh(self, name: str, sources: list) -> bool:
+        fresh = self._fresh.get(name)
+        if fresh is None:
+            fresh = True
+            for path, size, mtime_ns in sources:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # исходника нет (игра поставлена только с пакетами)
+                if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                    fresh = False
+                    break
+            self._fresh[name] = fresh
+        return fresh
+
+
+class AssetPacks:
+    """Подключённые пакеты; чтение по логическому пути с откатом на файлы."""
+
+    def __init__(self) -> None:
+        self._packs: dict[Path, AssetPack] = {}
+
+    def mount(self, pack_path: str | Path) -> bool:
+        """Подключает пакет, если он есть; True — пакет подключён."""
+        pack_path = Path(pack_path)
+        if pack_path in self._packs:
+            return True
+        if not pack_path.exists():
+            return False
+        try:
+            self._packs[pack_path] = AssetPack(pack_path)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"Ошибка открытия пакета {pack_path}: {e}")
+            return False
+        return True
+
+    def unmount(self, pack_path: str | Path) -> None:
+        pack = self._packs.pop(Path(pack_path), None)
+        if pack is not None:
+            pack.close()
+
+    def unmount_all(self) -> None:
+        for pack_path in list(self._packs):
+            self.unmount(pack_path)
+
+    def read(self, path: str | Path) -> memoryview | None:
+        """Данные файла из подключённого пакета (без копирования) или None."""
+        name = logical_path(path)
+        for pack in self._packs.values():
+            if name in pack:
+                return pack.read(name)
+        return None
+
+    def exists(self, path: str | Path) -> bool:
+        """Есть ли файл в пакете или на диске."""
+        name = logical_path(path)
+        return any(name in pack for pack in self._packs.values()) or os.path.exists(path)
+
+    def open(self, path: str | Path) -> BinaryIO:
+        """Файловый объект для чтения: из пакета, иначе с диска.
+
+        Для библиотек, которым нужен файл (pygame, json): данные из пакета
+        копируются в ``BytesIO`` один раз.
+        """
+        data = self.read(path)
+        if data is None:
+            return open(path, "rb")
+        with data:
+            return io.BytesIO(data)
+
+
+# Общий набор пакетов на всю игру
+packs = AssetPacks()
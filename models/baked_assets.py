@@ -0,0 +1,102 @@
+"""Заранее масштабированные изображения.
+
+``python -m tools.bake_assets`` один раз масштабирует картинки до размеров,
+которые им нужны в игре (кадры героя, HUD, фоны меню и сюжетные картинки
+под экран), и пишет их сырыми пикселями в ``BAKED_ASSETS_DIR``.  Такой
+файл читается одним ``read_bytes`` и ``pg.image.frombytes`` — без
+распаковки PNG и без ``transform.scale`` при старте и входе в сцену.
+
+Рядом лежит ``manifest.json``::
+
+    {"version": 1, "entries": {"<путь>|<W>x<H>|rgba": {
+        "file": "<sha256>.raw", "size": [W, H],
+        "source_sha256": ..., "source_size": ..., "source_mtime_ns": ...}}}
+
+Ключ — путь исходника от корня проекта, целевой размер (``orig`` —
+исходный) и формат (``rgba`` для convert_alpha(), ``rgb`` для convert()).
+Запись действительна, пока размер и время изменения исходника совпадают
+с записанными; иначе игра молча грузит PNG, а повторный запуск утилиты
+сверяет хэш содержимого и пересобирает только изменившиеся картинки.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pygame as pg
+
+from models.asset_pack import logical_path
+from models.constants import BAKED_ASSETS_DIR
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def asset_key(path: str | Path, size: tuple[int, int] | None, alpha: bool) -> str:
+    """Ключ записи манифеста; путь приводится к виду от корня проекта."""
+    return f"{logical_path(path)}|{f'{size[0]}x{size[1]}' if size else 'orig'}|{'rgba' if alpha else 'rgb'}"
+
+
+class BakedAssets:
+    """Читает изображения, подготовленные ``tools.bake_assets``."""
+
+    def __init__(self, root: str | Path = BAKED_ASSETS_DIR) -> None:
+        self.root = Path(root)
+        self._entries: dict[str, dict] | None = None  # манифест читается при первом запросе
+
+    # ---------------------------------------------------------------- public
+    def has(self, path: str | Path, *, size: tuple[int, int] | None = None, alpha: bool = True) -> bool:
+        """Есть ли действительная запись (PNG для неё декодировать не придётся)."""
+        return self._entry(path, size, alpha) is not None
+
+    def load(self, path: str | Path, size: tuple[int, int] | None = None, *,
+             alpha: bool = True) -> pg.Surface | None:
+        """Поверхность из кэша (ещё не конвертированная) или None, если записи нет."""
+        entry = self._entry(path, size, alpha)
+        if entry is None:
+            return None
+        fmt = "RGBA" if alpha else "RGB"
+        w, h = entry["size"]
+        try:
+            data = (self.root / entry["file"]).read_bytes()
+        except OSError:
+            return None
+        if len(data) != w * h * len(fmt):
+            return None  # файл обрезан или от другого формата
+        return pg.image.frombytes(data, (w, h), fmt)
+
+    def reload(self) -> None:
+        """Перечитать манифест при следующем запросе."""
+        self._entries = None
+
+    # ---------------------------------------------------------------- intern
+    def _entry(self, path: str | Path, size: tuple[int, int] | None, alpha: bool) -> dict | None:
+        entry = self._manifest().get(asset_key(path, size, alpha))
+        if entry is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != entry["source_size"] or st.st_mtime_ns != entry["source_mtime_ns"]:
+            return None  # исходник изменили после запекания
+        return entry
+
+    def _manifest(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.root / MANIFEST_NAME, encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("version") == MANIFEST_VERSION:
+                    self._entries = manifest["entries"]
+            except FileNotFoundError:
+                pass  # утилиту не запускали — грузим PNG как обычно
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Ошибка чтения {self.root / MANIFEST_NAME}: {e}")
+        return self._entries
+
+
+# Общий экземпляр на всю игру
+baked_assets = BakedAssets()
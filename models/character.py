@@ -6,6 +6,8 @@ from pathlib import Path
 
 import pygame as pg
 
+from models.resources import resources
+
 
 class Character(pg.sprite.Sprite):
     """Общее для игрока и NPC."""
@@ -22,4 +24,4 @@ class Character(pg.sprite.Sprite):
             s = pg.Surface((128, 128), pg.SRCALPHA)
             s.fill((255, 0, 255))
             return s
-        return pg.transform.scale(pg.image.load(path).convert_alpha(), (128, 128))
+        return resources.image(path, size=(128, 128))
@@ -0,0 +1,110 @@
+"""Фоновое запекание чанков уровня с вытеснением по бюджету памяти."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+import pygame as pg
+
+from models.display_format import reconvert
+
+ChunkKey = tuple[int, int]
+
+
+class ChunkStreamer:
+    """Держит запечённые чанки вокруг камеры, дальние вытесняет.
+
+    Главный поток каждый кадр сообщает, какие чанки нужны (``request``),
+    и рисует уже готовые (``get``).  Запекание идёт в фоновом потоке,
+    поэтому большие карты не требуют долгой загрузки целиком.
+    """
+
+    def __init__(self, bake: Callable[[ChunkKey], pg.Surface | None], budget_bytes: int) -> None:
+        self._bake = bake
+        self.budget_bytes = budget_bytes
+        self.bytes_used = 0
+        # Готовые чанки в порядке использования (LRU слева); None — пустой чанк
+        self._ready: OrderedDict[ChunkKey, pg.Surface | None] = OrderedDict()
+        self._wanted: list[ChunkKey] = []  # очередь запекания, важные — в конце
+        self._generation = 0  # растёт при смене формата окна; старые запекания отбрасываются
+        self._cond = threading.Condition()
+        self._alive = True
+        self._thread = threading.Thread(target=self._work, name="chunk-streamer", daemon=True)
+        self._thread.start()
+
+    # ---------------------------------------------------------------- public
+    def request(self, keys: Iterable[ChunkKey]) -> None:
+        """Задаёт нужные сейчас чанки по убыванию важности; прошлый запрос отменяется."""
+        with self._cond:
+            self._wanted = [key for key in keys if key not in self._ready]
+            self._wanted.reverse()
+            if self._wanted:
+                self._cond.notify()
+
+    def get(self, key: ChunkKey) -> pg.Surface | None:
+        """Готовая поверхность чанка или None, если он пуст или ещё запекается."""
+        with self._cond:
+            if key not in self._ready:
+                return None
+            self._ready.move_to_end(key)
+            return self._ready[key]
+
+    def evict(self, keep: set[ChunkKey]) -> None:
+        """Выбрасывает давно не использованные чанки, пока не уложимся в бюджет."""
+        with self._cond:
+            for key in list(self._ready):
+                if self.bytes_used <= self.budget_bytes:
+                    break
+                if key in keep:
+                    continue
+                surface = self._ready.pop(key)
+                if surface is not None:
+                    self.bytes_used -= _surface_bytes(surface)
+
+    def reconvert(self) -> None:
+        """Переводит готовые чанки в формат нового окна (вызывать из главного потока).
+
+        Чанк, который сейчас запекается в старом формате, не сохраняется и
+        будет запечён заново по следующему запросу.
+        """
+        with self._cond:
+            self._generation += 1
+            for key, surface in list(self._ready.items()):
+                if surface is not None:
+                    self._ready[key] = reconvert(surface)
+            self.bytes_used = sum(_surface_bytes(s) for s in self._ready.values() if s is not None)
+
+    def close(self) -> None:
+        """Останавливает фоновый поток."""
+        with self._cond:
+            self._alive = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+    # ---------------------------------------------------------------- worker
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while self._alive and not self._wanted:
+                    self._cond.wait()
+                if not self._alive:
+                    return
+                key = self._wanted.pop()
+                if key in self._ready:
+                    continue
+                generation = self._generation
+
+            # Запекаем без блокировки: главный поток в это время рисует кадр
+            surface = self._bake(key)
+
+            with self._cond:
+                if generation != self._generation:
+                    continue  # формат окна сменился во время запекания
+                self._ready[key] = surface
+                if surface is not None:
+                    self.bytes_used += _surface_bytes(surface)
+
+
+def _surface_bytes(surface: pg.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
@@ -7,6 +7,8 @@ from typing import Dict
 
 import pygame as pg
 
+from models.display_format import display_format
+
 _DEFAULT: Dict = {
     "key_bindings": {
         "left": pg.K_a,
@@ -20,6 +22,7 @@ _DEFAULT: Dict = {
     "fullscreen": True,
     "window_size": [1280, 720],
     "music_volume": 0.7,
+    "typewriter": False,  # печатать реплики диалогов посимвольно
 }
 _CFG = "config.json"
 
@@ -58,6 +61,11 @@ class Config:
         self.data["music_volume"] = round(max(0.0, min(v, 1.0)), 1)
         pg.mixer.music.set_volume(self.data["music_volume"])
 
+    @property
+    def typewriter(self) -> bool:    return self.data["typewriter"]
+    @typewriter.setter
+    def typewriter(self, v: bool):   self.data["typewriter"] = bool(v)
+
     # --------------------------- file ops ---------------------------------
     def _load(self) -> Dict:
         if os.path.exists(_CFG):
@@ -97,6 +105,8 @@ class Config:
             size = (960, 540)
             self.screen = pg.display.set_mode(size, flags)
             pg.display.set_caption("Fallen Knight")
+        # Формат пикселей мог смениться — переконвертируем поверхности
+        display_format.mode_changed()
 
     def _reset_display(self) -> None:
         """Пересоздаём окно.  Если RESIZABLE, при ошибке возвращаем safe-размер."""
@@ -114,6 +124,7 @@ class Config:
             try:
                 self.screen = pg.display.set_mode((960, 540), pg.RESIZABLE)
                 pg.display.set_caption("Fallen Knight")
+                display_format.mode_changed()
             except pg.error as e2:
                 print(f"Критическая ошибка дисплея: {e2}")
 
@@ -2,6 +2,10 @@
 TILE_SIZE = 64
 MAP_W_TILES, MAP_H_TILES = 100, 100
 WORLD_WIDTH_PX, WORLD_HEIGHT_PX = MAP_W_TILES * TILE_SIZE, MAP_H_TILES * TILE_SIZE
+CHUNK_TILES = 16          # сторона запечённого чанка уровня в тайлах
+CHUNK_BUDGET_BYTES = 256 * 1024 * 1024  # память под чанки в потоковом режиме
+RESOURCE_BUDGET_BYTES = 192 * 1024 * 1024  # кэш изображений/звуков/шрифтов
+BAKED_ASSETS_DIR = "assets/.baked"  # заранее масштабированные изображения (tools.bake_assets)
 
 CAM_LERP = 0.20           # без мёртвой зоны → чуть медленнее
 
@@ -9,5 +13,7 @@ GRAVITY, JUMP_SPEED = 0.6, -12.0
 MAX_FALL_SPEED = 18.0
 BASE_SPEED, SPRINT_MULT = 4.0, 1.2
 DOUBLE_CLICK_MS = 250
+MAX_FRAME_DT = 0.1        # дольше этого кадр анимации не сдвигают (сек)
+TYPEWRITER_CPS = 40       # скорость печати реплик (если включена в настройках), символов в секунду
 
 BG_COLOR = (50, 50, 70)
@@ -1,7 +1,7 @@
 """Модель сюжетных диалогов.
 
 Читает сценарий из ``assets/story.json`` (или ``assets/story.txt``) и
-подготавливает список реплик.
+выдаёт реплики по индексу.
 
 Формат ``story.json``::
 
@@ -16,9 +16,13 @@
       …
     ]
 
-Если файла *.json* нет, пробует ``story.txt`` — по строке на реплику
+Сценарий читается из пакета главы (``models.asset_pack``), если он
+подключён, иначе с диска.  Если файла *.json* нет, пробует ``story.txt`` — по строке на реплику
 (формат: TEXT|image_path|sound_path).  Дополнительные поля можно опустить.
 
+Реплики разбираются лениво по индексу смещений (``models.script_index``):
+открытие главы не зависит от длины сценария.
+
 Модель не зависит от Pygame.
 """
 from __future__ import annotations
@@ -27,6 +31,10 @@ from dataclasses import dataclass
 from pathlib import Path
 import json
 
+import numpy as np
+
+from models.script_index import ScriptData, open_script
+
 
 @dataclass(frozen=True, slots=True)
 class DialogueEntry:
@@ -38,62 +46,73 @@ class DialogueEntry:
 
 
 class DialogModel:
-    """Загружает и предоставляет реплики по индексу."""
+    """Предоставляет реплики по индексу, разбирая их по мере запроса.
+
+    Сценарий не читается целиком: ``models.script_index`` хранит байтовые
+    границы реплик, и ``get`` декодирует только нужную.
+    """
 
     def __init__(self, assets_dir: str = "assets/chapters/level_0/") -> None:
-        self.entries: list[DialogueEntry] = self._load_script(Path(assets_dir))
+        self._data, self._offsets, self._is_json = self._open_script(Path(assets_dir))
+        self._parsed: dict[int, DialogueEntry] = {}  # уже разобранные реплики
 
     # ---------------------------------------------------------------- public
     def __len__(self) -> int:
-        return len(self.entries)
+        return len(self._offsets)
 
     def get(self, index: int) -> DialogueEntry:
-        return self.entries[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"нет реплики {index} (всего {len(self)})")
+        entry = self._parsed.get(index)
+        if entry is None:
+            start, end = (int(offset) for offset in self._offsets[index])
+            raw = bytes(self._data[start:end])
+            entry = self._parse_json(raw) if self._is_json else self._parse_line(raw)
+            self._parsed[index] = entry
+        return entry
+
+    @property
+    def entries(self) -> list[DialogueEntry]:
+        """Все реплики сразу — для утилит сборки; в игре используйте ``get``."""
+        return [self.get(i) for i in range(len(self))]
 
     # ---------------------------------------------------------------- intern
     @staticmethod
-    def _load_script(root: Path) -> list[DialogueEntry]:
+    def _open_script(root: Path) -> tuple[ScriptData, np.ndarray, bool]:
         story_json = root / "story.json"
-        if story_json.exists():
-            with story_json.open("r", encoding="utf-8") as f:
-                raw = json.load(f)
-            for item in raw:
-                if 'image' in item and item['image']:
-                    # Пути в JSON уже должны быть относительно корня проекта, используем их напрямую
-                    # item['image'] = str(Path(root.parent.parent) / item['image']).replace('\\\\', '/') # Старая некорректная строка
-                    pass # Используем путь как есть
-                if 'sound' in item and item['sound']:
-                    # Пути в JSON уже должны быть относительно корня проекта, используем их напрямую
-                    # item['sound'] = str(Path(root.parent.parent) / item['sound']).replace('\\\\', '/') # Старая некорректная строка
-                    pass # Используем путь как есть
-                if 'portrait' in item and item['portrait']:
-                    # Пути в JSON уже должны быть относительно корня проекта, используем их напрямую
-                    # item['portrait'] = str(Path(root.parent.parent) / item['portrait']).replace('\\\\', '/') # Старая некорректная строка
-                    pass # Используем путь как есть
-            return [DialogueEntry(**item) for item in raw]
+        script = open_script(story_json)
+        if script is not None:
+            # Пути в JSON уже относительно корня проекта и используются как есть
+            return (*script, True)
 
         # ----- fallback: story.txt (|‑разделители) -------------------------
-        story_txt = root / "story.txt"
-        if story_txt.exists():
-            result: list[DialogueEntry] = []
-            with story_txt.open("r", encoding="utf-8") as f:
-                for line in f:
-                    parts = line.strip().split("|")
-                    entry_data = {"text": parts[0]}
-                    
-                    # Добавляем остальные поля, если они есть
-                    if len(parts) > 1 and parts[1]:
-                        entry_data["image"] = parts[1]
-                    if len(parts) > 2 and parts[2]:
-                        entry_data["sound"] = parts[2]
-                    if len(parts) > 3 and parts[3]:
-                        entry_data["speaker"] = parts[3]
-                    if len(parts) > 4 and parts[4]:
-                        entry_data["portrait"] = parts[4]
-                    
-                    result.append(DialogueEntry(**entry_data))
-            return result
+        script = open_script(root / "story.txt")
+        if script is not None:
+            return (*script, False)
 
         raise FileNotFoundError(
             f"Не найден сценарий '{story_json}' или 'assets/story.txt'"
         )
+
+    @staticmethod
+    def _parse_json(raw: bytes) -> DialogueEntry:
+        return DialogueEntry(**json.loads(raw))
+
+    @staticmethod
+    def _parse_line(raw: bytes) -> DialogueEntry:
+        parts = raw.decode("utf-8").strip().split("|")
+        entry_data = {"text": parts[0]}
+
+        # Добавляем остальные поля, если они есть
+        if len(parts) > 1 and parts[1]:
+            entry_data["image"] = parts[1]
+        if len(parts) > 2 and parts[2]:
+            entry_data["sound"] = parts[2]
+        if len(parts) > 3 and parts[3]:
+            entry_data["speaker"] = parts[3]
+        if len(parts) > 4 and parts[4]:
+            entry_data["portrait"] = parts[4]
+
+        return DialogueEntry(**entry_data)
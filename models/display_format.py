@@ -0,0 +1,70 @@
+"""Формат пикселей экрана и переконвертация поверхностей при смене видеорежима.
+
+``convert``/``convert_alpha`` приводят поверхность к формату текущего окна,
+и тогда блит идёт по быстрому пути без преобразования пикселей.  После
+``pg.display.set_mode`` (vsync, полноэкранный режим) формат может
+смениться, и старые поверхности начнут конвертироваться на каждом блите.
+
+pygame не умеет конвертировать поверхность на месте, поэтому владельцы
+поверхностей (кэш ресурсов, HUD, меню, анимации, уровень) подписываются
+через ``display_format.listen`` на смену формата и сами пересоздают свои
+поверхности.  Подписка слабая: как только владелец удалён сборщиком мусора,
+его запись убирается из списка (колбэк weakref), поэтому список не растёт
+от сцены к сцене.
+"""
+from __future__ import annotations
+
+import weakref
+from typing import Callable
+
+import pygame as pg
+
+
+class DisplayFormat:
+    """Помнит формат окна и оповещает подписчиков, когда он меняется."""
+
+    def __init__(self) -> None:
+        self._format: tuple | None = None
+        self._listeners: list[weakref.WeakMethod] = []
+        self.changes = 0  # сколько раз переконвертировали поверхности
+
+    def listen(self, callback: Callable[[], None]) -> None:
+        """Подписывает метод объекта на смену формата (без удержания объекта)."""
+        self._listeners.append(weakref.WeakMethod(callback, self._forget))
+
+    def mode_changed(self) -> bool:
+        """Вызывать после каждого ``pg.display.set_mode``.
+
+        Если формат пикселей окна изменился, подписчики переконвертируют
+        свои поверхности; возвращает True в этом случае.
+        """
+        surface = pg.display.get_surface()
+        if surface is None:
+            return False
+        fmt = (surface.get_bitsize(), surface.get_masks())
+        if self._format is None or fmt == self._format:
+            # Первый видеорежим (конвертировать ещё нечего) или формат прежний
+            self._format = fmt
+            return False
+        self._format = fmt
+        self.changes += 1
+
+        # Копия: подписчики могут появляться и удаляться во время обхода
+        for ref in list(self._listeners):
+            callback = ref()
+            if callback is not None:
+                callback()
+        return True
+
+    def _forget(self, dead: weakref.WeakMethod) -> None:
+        """Убирает подписку удалённого объекта."""
+        self._listeners = [ref for ref in self._listeners if ref is not dead]
+
+
+def reconvert(surface: pg.Surface) -> pg.Surface:
+    """Новая копия поверхности в формате текущего окна (с альфой, если она была)."""
+    return surface.convert_alpha() if surface.get_flags() & pg.SRCALPHA else surface.convert()
+
+
+# Общий реестр на всю игру
+display_format = DisplayFormat()
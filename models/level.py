@@ -1,76 +1,520 @@
 import pygame as pg
 import csv
-from models.constants import TILE_SIZE
+import math
+import numpy as np
+from models.constants import TILE_SIZE, CHUNK_TILES, CHUNK_BUDGET_BYTES
 import os
-import pytmx # Импортируем библиотеку для работы с TMX файлами
+import weakref
+from dataclasses import dataclass
+from models.chunk_streamer import ChunkStreamer
+from models.level_cache import CompiledLevel, TileRef, load_level
+from models.asset_pack import packs
+from models.resources import resources
+from models.display_format import display_format, reconvert
+
+# Где искать картинки тайлсетов, сохранённых вне проекта
+TILE_ASSETS_PATH = "assets/textures/map/"
+
+
+@dataclass(frozen=True, slots=True)
+class RayHit:
+    """Первая твёрдая клетка на пути луча."""
+    point: tuple[float, float]  # точка входа луча в клетку, мировые пиксели
+    cell: tuple[int, int]       # клетка мира (столбец, строка)
+    normal: tuple[int, int]     # нормаль грани, через которую вошёл луч; (0, 0) — начало внутри
+    distance: float             # путь от начала луча в пикселях
+
+
+class _TileClock:
+    """Общие часы анимированного GID: одни на все клетки с этим тайлом."""
+    __slots__ = ("frames", "durations", "idx", "elapsed")
+
+    def __init__(self, frames: list[tuple[int, int]]):
+        self.frames = [gid for gid, _ in frames]
+        self.durations = [duration for _, duration in frames]
+        self.idx, self.elapsed = 0, 0
+
+    @property
+    def gid(self) -> int:
+        """GID текущего кадра."""
+        return self.frames[self.idx]
+
+    def advance(self, dt: int) -> bool:
+        """Сдвигает часы на dt мс; True, если сменился кадр."""
+        total = sum(self.durations)
+        if total <= 0 or len(self.frames) < 2:
+            return False
+        start = self.idx
+        self.elapsed += dt % total  # полные циклы кадр не меняют
+        while self.elapsed >= self.durations[self.idx]:
+            self.elapsed -= self.durations[self.idx]
+            self.idx = (self.idx + 1) % len(self.frames)
+        return self.idx != start
 
-class Tile(pg.sprite.Sprite):
-    """Представляет один тайл уровня."""
-    def __init__(self, image: pg.Surface, x: int, y: int):
-        super().__init__()
-        self.image = image
-        self.rect = self.image.get_rect(topleft=(x, y))
 
 class Level:
-    """Загружает и хранит данные уровня, создает тайлы."""
+    """Загружает и хранит данные уровня, запекает и рисует чанки тайлов."""
 
-    def __init__(self, tmx_path: str, tile_assets_path: str = "assets/textures/map/"): # Меняем csv_path на tmx_path
+    def __init__(self, tmx_path: str, tile_assets_path: str = TILE_ASSETS_PATH, # Меняем csv_path на tmx_path
+                 *, streaming: bool | None = None, chunk_budget: int = CHUNK_BUDGET_BYTES):
         self.display_surface = pg.display.get_surface()
-        self.tiles = pg.sprite.Group()  # Группа для всех тайлов (для отрисовки)
-        self.collidable_tiles = pg.sprite.Group() # Группа для тайлов с коллизией
+        # Масштабированные изображения тайлов, общие для всех клеток одного GID
+        self._gid_images: dict[int, pg.Surface] = {}
+        self.image_bytes_saved = 0  # сколько байт поверхностей сэкономил кэш по GID
+        # Запечённые чанки статичных слоёв: (cx, cy) -> поверхность
+        self.chunks: dict[tuple[int, int], pg.Surface] = {}
+        # Образец формата чанков (формат окна с альфой): фоновый поток создаёт
+        # чанки сразу в нём, потому что convert_alpha() там вызывать нельзя
+        self._chunk_format = pg.Surface((1, 1), pg.SRCALPHA).convert_alpha()
         self.tile_assets_path = tile_assets_path # Сохраняем путь к ассетам тайлов
 
-        # Загрузка TMX карты
-        self.tmx_data = self._load_tmx(tmx_path) # Новый метод загрузки TMX
-        self.tile_size = self.tmx_data.tilewidth # Берем размер тайла из TMX данных
+        # Загрузка TMX карты (через скомпилированный кэш рядом с TMX)
+        self.data = self._load_tmx(tmx_path)
+        # Берем размер тайла из TMX данных
+        self.tile_size = self.data.tile_size if self.data else TILE_SIZE
+        # Исходные изображения тайлсетов: путь -> поверхность
+        self._sources: dict[str, pg.Surface] = {}
+        # Сетка коллизий [строка, столбец] от data.origin: True — клетка твёрдая
+        self.solid = np.zeros((0, 0), dtype=bool)
+        # Слитые прямоугольники коллизий и их индекс по ячейкам размером с чанк
+        self.collision_rects: list[pg.Rect] = []
+        self._rect_index: dict[tuple[int, int], list[int]] = {}
+        # Анимированные тайлы: часы на GID, номер смены кадров и клетки чанков с анимацией
+        self._clocks: dict[int, _TileClock] = {}
+        self._anim_tick = 0
+        self._anim_gids = np.zeros(0, dtype=np.uint32)
+        self._anim_cells: dict[tuple[int, int], list[tuple[pg.Rect, list[int]]]] = {}
+        self._chunk_ticks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
         # Создание уровня из TMX данных
-        self._create_level() # Создаем спрайты на основе TMX
+        self._create_level()
+        display_format.listen(self._reconvert_tiles)
+
+        # Большие и бесконечные карты запекаем по мере приближения камеры
+        if streaming is None:
+            streaming = bool(self.data) and (self.data.infinite or self._full_bake_bytes() > chunk_budget)
+        self._streamer = ChunkStreamer(self._bake_chunk, chunk_budget) if streaming else None
+        if not streaming:
+            self._bake_chunks()  # Запекаем тайлы в крупные поверхности для отрисовки
 
-    def _load_tmx(self, path: str):
-        """Загружает данные уровня из TMX файла."""
+    def _load_tmx(self, path: str) -> CompiledLevel | None:
+        """Загружает данные уровня: из кэша, если он свежий, иначе из TMX."""
         try:
-            # Передаем правильный путь к папке с ассетами тайлов
-            tmx_data = pytmx.load_pygame(path, gidmap='base64', folder=self.tile_assets_path)
-            return tmx_data
+            return load_level(path)
         except Exception as e:
             print(f"Ошибка загрузки TMX файла {path}: {e}")
             return None # Возвращаем None в случае ошибки загрузки
 
+    def close(self) -> None:
+        """Останавливает фоновую подгрузку чанков (если она была)."""
+        if self._streamer:
+            self._streamer.close()
+            self._streamer = None
+
     def _create_level(self) -> None:
-        """Создает спрайты тайлов на основе загруженных TMX данных."""
-        if not self.tmx_data:
+        """Готовит изображения тайлов и сетку коллизий по данным TMX."""
+        if not self.data:
             return # Ничего не создаем, если TMX данные не загружены
 
-        # Итерируем по всем видимым слоям TMX карты
-        for layer in self.tmx_data.visible_layers:
-            # Проверяем, является ли слой слоем с тайлами
-            if isinstance(layer, pytmx.TiledTileLayer):
-                # Итерируем по всем тайлам в слое
-                for x, y, gid, in layer:
-                    # Проверяем, не является ли тайл пустым (GID 0)
-                    if gid != 0:
-                        # Получаем изображение тайла по его GID
-                        tile_image = self.tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            # Получаем свойства тайла из TMX данных
-                            props = self.tmx_data.get_tile_properties_by_gid(gid)
-                            # Проверяем свойство 'collidable' ИЛИ принудительно делаем тайлы 1 и 2 коллайдабельными
-                            is_collidable = (props and props.get('collidable', False)) or (gid in {1, 2})
-
-                            # Масштабируем изображение тайла до размера, указанного в TMX
-                            scaled_image = pg.transform.scale(tile_image, (self.tile_size, self.tile_size))
-
-                            # Создаем спрайт тайла
-                            tile_sprite = Tile(scaled_image, x * self.tile_size, y * self.tile_size)
-                            self.tiles.add(tile_sprite)
-
-                            # Если тайл коллайдабельный, добавляем его в соответствующую группу
-                            if is_collidable:
-                                self.collidable_tiles.add(tile_sprite)
+        # Картинки всех GID готовим заранее в главном потоке: фоновое
+        # запекание чанков только читает их
+        if self.data.layers:
+            gids, counts = np.unique(np.concatenate([grid.ravel() for grid in self.data.layers]),
+                                     return_counts=True)
+        else:
+            gids, counts = np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.intp)
+        for gid, count in zip(gids.tolist(), counts.tolist()):
+            # Проверяем, не является ли тайл пустым (GID 0)
+            if gid != 0:
+                image = self._tile_image(gid)
+                if image:
+                    self.image_bytes_saved += (count - 1) * image.get_pitch() * image.get_height()
+
+        # Анимированные GID: одни часы на GID, кадры тоже готовим заранее
+        for gid, frames in self.data.animations.items():
+            self._clocks[gid] = _TileClock(frames)
+            for frame_gid, _ in frames:
+                self._tile_image(frame_gid)
+        self._anim_gids = np.fromiter(self._clocks, dtype=np.uint32)
+
+        # Коллайдабельность (свойство 'collidable' и тайлы 1, 2) посчитана при компиляции
+        # один раз на GID; маска всей карты — векторная проверка по сеткам слоёв
+        collidable = np.fromiter(self.data.collidable, dtype=np.uint32)
+        self.solid = np.zeros((self.data.height, self.data.width), dtype=bool)
+        for grid in self.data.layers:
+            self.solid |= np.isin(grid, collidable)
+        self._build_collision_rects()
+
+    def _reconvert_tiles(self) -> None:
+        """Переводит изображения тайлов и запечённые чанки в формат нового окна."""
+        # Словари заменяются целиком: фоновое запекание читает их без блокировки
+        self._gid_images = {gid: reconvert(image) for gid, image in self._gid_images.items()}
+        self._chunk_format = reconvert(self._chunk_format)
+        # Новые поверхности чанков ещё не видели кадров анимации — _refresh_chunk их дорисует
+        self.chunks = {key: reconvert(chunk) for key, chunk in self.chunks.items()}
+        if self._streamer:
+            self._streamer.reconvert()
+
+    def _tile_image(self, gid: int) -> pg.Surface | None:
+        """Масштабированное изображение GID: создаётся один раз, дальше переиспользуется."""
+        image = self._gid_images.get(gid)
+        if image is not None:
+            return image
+        ref = self.data.tiles.get(gid)
+        tile_image = self._load_tile_ref(ref) if ref else None
+        if not tile_image:
+            return None
+        # Масштабируем изображение тайла до размера, указанного в TMX
+        image = pg.transform.scale(tile_image, (self.tile_size, self.tile_size))
+        image = image.convert_alpha() if image.get_flags() & pg.SRCALPHA else image.convert()
+        self._gid_images[gid] = image
+        return image
+
+    def _load_tile_ref(self, ref: TileRef) -> pg.Surface | None:
+        """Вырезает изображение тайла из файла тайлсета с учётом отражений."""
+        path = self.data.resolve(ref)
+        source = self._sources.get(path)
+        if source is None:
+            # Если тайлсет лежит вне проекта, ищем картинку в папке ассетов тайлов
+            if not packs.exists(path):
+                path = os.path.join(self.tile_assets_path, os.path.basename(path))
+            try:
+                source = resources.image(path)
+            except (pg.error, FileNotFoundError) as e:
+                print(f"Ошибка загрузки тайлсета {path}: {e}")
+                return None
+            self._sources[self.data.resolve(ref)] = source
+
+        image = source.subsurface(ref.rect) if ref.rect else source
+        if ref.flip_d:
+            image = pg.transform.flip(pg.transform.rotate(image, 270), True, False)
+        if ref.flip_x or ref.flip_y:
+            image = pg.transform.flip(image, ref.flip_x, ref.flip_y)
+        if ref.colorkey:
+            image = image.convert()
+            image.set_colorkey(pg.Color(f"#{ref.colorkey}"), pg.RLEACCEL)
+        return image
+
+    # ------------------------------------------------------------ коллизии
+    @property
+    def map_rect(self) -> pg.Rect:
+        """Границы карты в мировых пикселях."""
+        if not self.data:
+            return pg.Rect(0, 0, 0, 0)
+        ts = self.tile_size
+        ox, oy = self.data.origin
+        return pg.Rect(ox * ts, oy * ts, self.data.width * ts, self.data.height * ts)
+
+    def query_rect(self, rect: pg.Rect) -> list[pg.Rect]:
+        """Возвращает прямоугольники коллизий, пересекающиеся с ``rect``.
+
+        Проверяются только ячейки индекса под ``rect``, поэтому стоимость
+        запроса не зависит от размера карты.
+        """
+        if not self.collision_rects:
+            return []
+        found: set[int] = set()
+        for key in self._chunk_keys(rect):
+            found.update(self._rect_index.get(key, ()))
+        rects = self.collision_rects
+        return [rects[i] for i in sorted(found) if rects[i].colliderect(rect)]
+
+    def move_rect(self, rect: pg.Rect, dx: int, dy: int) -> tuple[bool, bool]:
+        """Сдвигает ``rect`` на (dx, dy), останавливая его у прямоугольников коллизий.
+
+        Сначала по X, затем по Y.  Проверяется вся полоса, которую заметает
+        край прямоугольника, поэтому быстрые тела не пролетают сквозь тонкие
+        платформы, а стоимость зависит только от пересечённых ячеек.
+        Возвращает (упёрлись по X, упёрлись по Y).
+        """
+        allowed_x, allowed_y = dx, dy
+        if dx:
+            swept = (pg.Rect(rect.right, rect.top, dx, rect.height) if dx > 0
+                     else pg.Rect(rect.left + dx, rect.top, -dx, rect.height))
+            for solid in self.query_rect(swept):
+                # Прямоугольники, с которыми тело уже пересекается, не держат его
+                if dx > 0 and solid.left >= rect.right:
+                    allowed_x = min(allowed_x, solid.left - rect.right)
+                elif dx < 0 and solid.right <= rect.left:
+                    allowed_x = max(allowed_x, solid.right - rect.left)
+            rect.x += allowed_x
+        if dy:
+            swept = (pg.Rect(rect.left, rect.bottom, rect.width, dy) if dy > 0
+                     else pg.Rect(rect.left, rect.top + dy, rect.width, -dy))
+            for solid in self.query_rect(swept):
+                if dy > 0 and solid.top >= rect.bottom:
+                    allowed_y = min(allowed_y, solid.top - rect.bottom)
+                elif dy < 0 and solid.bottom <= rect.top:
+                    allowed_y = max(allowed_y, solid.bottom - rect.top)
+            rect.y += allowed_y
+        return allowed_x != dx, allowed_y != dy
+
+    # ---------------------------------------------------------------- лучи
+    def raycast(self, origin, direction, max_dist: float) -> RayHit | None:
+        """Пускает луч по сетке ``solid`` и возвращает первое попадание или None.
+
+        Обход клеток — DDA (Amanatides & Woo): шаг всегда в ближайшую по лучу
+        соседнюю клетку, поэтому работа пропорциональна числу пересечённых
+        клеток, а не размеру карты или числу прямоугольников коллизий.
+        """
+        dx, dy = direction
+        length = math.hypot(dx, dy)
+        if not length or max_dist <= 0 or not self.solid.size:
+            return None
+        dx, dy = dx / length, dy / length
+        ts = self.tile_size
+        ox, oy = self.data.origin
+        rows, cols = self.solid.shape
+
+        # Дальше считаем в клетках сетки: t — путь вдоль луча
+        gx, gy = origin[0] / ts - ox, origin[1] / ts - oy
+        t_enter, t_exit = 0.0, max_dist / ts
+        normal = (0, 0)
+        # Обрезаем луч по границам сетки: снаружи карта пустая
+        for axis, (pos, d, size) in enumerate(((gx, dx, cols), (gy, dy, rows))):
+            if not d:
+                if not 0 <= pos < size:
+                    return None
+                continue
+            near, far = -pos / d, (size - pos) / d
+            if near > far:
+                near, far = far, near
+            if near > t_enter:
+                t_enter = near
+                step = 1 if d > 0 else -1
+                normal = (-step, 0) if axis == 0 else (0, -step)
+            t_exit = min(t_exit, far)
+        # Луч, который лишь касается сетки снаружи (например, начинается на
+        # правой/нижней границе и смотрит наружу), — промах: при t_enter == t_exit
+        # зажим ниже отнёс бы его к последней клетке, в которую луч не входит.
+        # Начало на левой/верхней границе лежит в клетке 0 и остаётся попаданием.
+        inside = 0 <= gx < cols and 0 <= gy < rows
+        if t_enter > t_exit or (t_enter == t_exit and not inside):
+            return None
+
+        px, py = gx + dx * t_enter, gy + dy * t_enter
+        col = min(max(math.floor(px), 0), cols - 1)
+        row = min(max(math.floor(py), 0), rows - 1)
+        step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        # Путь до ближайшей вертикальной/горизонтальной грани и шаг между гранями
+        next_x = t_enter + (col + (dx > 0) - px) / dx if dx else math.inf
+        next_y = t_enter + (row + (dy > 0) - py) / dy if dy else math.inf
+        delta_x = abs(1 / dx) if dx else math.inf
+        delta_y = abs(1 / dy) if dy else math.inf
+
+        t = t_enter
+        solid = self.solid
+        while True:
+            if solid[row, col]:
+                return RayHit(
+                    point=(origin[0] + dx * t * ts, origin[1] + dy * t * ts),
+                    cell=(col + ox, row + oy),
+                    normal=normal,
+                    distance=t * ts,
+                )
+            if next_x < next_y:
+                t, col, normal = next_x, col + step_x, (-step_x, 0)
+                next_x += delta_x
+            else:
+                t, row, normal = next_y, row + step_y, (0, -step_y)
+                next_y += delta_y
+            if t > t_exit or not (0 <= col < cols and 0 <= row < rows):
+                return None
+
+    def line_of_sight(self, a, b) -> bool:
+        """True, если отрезок a–b не пересекает твёрдых клеток."""
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        dist = math.hypot(dx, dy)
+        if not dist:
+            # Вырожденный отрезок: видно, если точка не внутри стены
+            return self.raycast(a, (1, 0), 1e-9) is None
+        return self.raycast(a, (dx, dy), dist) is None
+
+    def _build_collision_rects(self) -> None:
+        """Сливает соседние твёрдые клетки в крупные прямоугольники (greedy meshing).
+
+        Каждая строка режется на непрерывные отрезки твёрдых клеток, а
+        одинаковые отрезки соседних строк склеиваются в один прямоугольник.
+        Так длинный пол — один прямоугольник без стыков между тайлами.
+        """
+        ts = self.tile_size
+        ox, oy = self.data.origin
+        height, width = self.solid.shape
+
+        # Начала (+1) и концы (-1) отрезков в каждой строке
+        padded = np.zeros((height, width + 2), dtype=np.int8)
+        padded[:, 1:-1] = self.solid
+        edges = np.diff(padded, axis=1)
+        rows, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+
+        rects = self.collision_rects
+        active: dict[tuple[int, int], int] = {}  # отрезок (c0, c1) -> первая строка
+
+        def close(span: tuple[int, int], last_row: int) -> None:
+            first = active.pop(span)
+            rects.append(pg.Rect((ox + span[0]) * ts, (oy + first) * ts,
+                                 (span[1] - span[0]) * ts, (last_row - first + 1) * ts))
+
+        prev_row = None
+        i, n = 0, len(rows)
+        while i < n:
+            row = int(rows[i])
+            spans = set()
+            while i < n and rows[i] == row:
+                spans.add((int(starts[i]), int(ends[i])))
+                i += 1
+            # Отрезок, не продолжившийся в этой строке, закрывает прямоугольник
+            for span in [s for s in active if s not in spans or row != prev_row + 1]:
+                close(span, prev_row)
+            for span in spans:
+                active.setdefault(span, row)
+            prev_row = row
+        for span in list(active):
+            close(span, prev_row)
+
+        for idx, rect in enumerate(rects):
+            for key in self._chunk_keys(rect):
+                self._rect_index.setdefault(key, []).append(idx)
+
+    # ------------------------------------------------------------ чанки
+    @property
+    def chunk_px(self) -> int:
+        """Сторона чанка в пикселях."""
+        return CHUNK_TILES * self.tile_size
+
+    def _chunk_area(self, key: tuple[int, int]) -> pg.Rect:
+        """Мировой прямоугольник чанка, обрезанный по границе карты."""
+        chunk_px = self.chunk_px
+        return pg.Rect(key[0] * chunk_px, key[1] * chunk_px, chunk_px, chunk_px).clip(self.map_rect)
+
+    def _chunk_keys(self, area: pg.Rect) -> list[tuple[int, int]]:
+        chunk_px = self.chunk_px
+        return [
+            (cx, cy)
+            for cy in range(area.top // chunk_px, (area.bottom - 1) // chunk_px + 1)
+            for cx in range(area.left // chunk_px, (area.right - 1) // chunk_px + 1)
+        ]
+
+    def _full_bake_bytes(self) -> int:
+        """Сколько памяти займут все чанки карты, если запечь их сразу."""
+        map_rect = self.map_rect
+        return map_rect.width * map_rect.height * 4
+
+    def _bake_chunk(self, key: tuple[int, int]) -> pg.Surface | None:
+        """Рисует все слои чанка в одну поверхность; None для пустого чанка.
+
+        Вызывается и из фонового потока, поэтому только читает готовые данные.
+        """
+        area = self._chunk_area(key)
+        if not area.width or not area.height:
+            return None
+        ts = self.tile_size
+        ox, oy = self.data.origin
+        col0, row0 = area.left // ts - ox, area.top // ts - oy
+        cols, rows = area.width // ts, area.height // ts
+
+        blits = []
+        for grid in self.data.layers:
+            window = grid[row0:row0 + rows, col0:col0 + cols]
+            # Непустые клетки находим одной операцией, по строкам — как рисовали раньше
+            rs, cs = np.nonzero(window)
+            for r, c, gid in zip(rs.tolist(), cs.tolist(), window[rs, cs].tolist()):
+                image = self._frame_image(gid)
+                if image:
+                    blits.append((image, (c * ts, r * ts)))
+        if not blits:
+            return None
+        # Сразу в формате окна: самый крупный блит кадра идёт по быстрому пути
+        chunk = pg.Surface(area.size, pg.SRCALPHA, self._chunk_format)
+        chunk.blits(blits, doreturn=False)
+        return chunk
+
+    def _frame_image(self, gid: int) -> pg.Surface | None:
+        """Изображение GID с учётом текущего кадра его анимации."""
+        clock = self._clocks.get(gid)
+        return self._gid_images.get(clock.gid if clock else gid)
+
+    # ------------------------------------------------------------ анимации
+    def update(self, dt: float) -> None:
+        """Продвигает часы анимированных тайлов на dt миллисекунд.
+
+        Часы одни на GID, поэтому стоимость не зависит от того, сколько
+        клеток карты занято анимированными тайлами.
+        """
+        changed = False
+        for clock in self._clocks.values():
+            changed |= clock.advance(dt)
+        if changed:
+            self._anim_tick += 1
+
+    def _chunk_anim_cells(self, key: tuple[int, int]) -> list[tuple[pg.Rect, list[int]]]:
+        """Клетки чанка с анимированными GID: (область в чанке, GID всех слоёв по порядку)."""
+        cells = self._anim_cells.get(key)
+        if cells is not None:
+            return cells
+        area = self._chunk_area(key)
+        ts = self.tile_size
+        ox, oy = self.data.origin
+        col0, row0 = area.left // ts - ox, area.top // ts - oy
+        windows = [grid[row0:row0 + area.height // ts, col0:col0 + area.width // ts]
+                   for grid in self.data.layers]
+
+        animated = np.zeros(windows[0].shape if windows else (0, 0), dtype=bool)
+        for window in windows:
+            animated |= np.isin(window, self._anim_gids)
+        cells = []
+        for r, c in zip(*(axis.tolist() for axis in np.nonzero(animated))):
+            gids = [int(window[r, c]) for window in windows if window[r, c]]
+            cells.append((pg.Rect(c * ts, r * ts, ts, ts), gids))
+        self._anim_cells[key] = cells
+        return cells
+
+    def _refresh_chunk(self, key: tuple[int, int], chunk: pg.Surface) -> None:
+        """Перерисовывает в чанке только клетки с анимацией, если сменились кадры."""
+        if self._chunk_ticks.get(chunk) == self._anim_tick:
+            return
+        self._chunk_ticks[chunk] = self._anim_tick
+        blits = []
+        for cell, gids in self._chunk_anim_cells(key):
+            chunk.fill((0, 0, 0, 0), cell)  # стираем прошлый кадр вместе с нижними слоями
+            for gid in gids:
+                image = self._frame_image(gid)
+                if image:
+                    blits.append((image, cell.topleft))
+        if blits:
+            chunk.blits(blits, doreturn=False)
+
+    def _bake_chunks(self) -> None:
+        """Запекает все чанки карты сразу (небольшие конечные карты)."""
+        if not self.data:
+            return
+        for key in self._chunk_keys(self.map_rect):
+            chunk = self._bake_chunk(key)
+            if chunk is not None:
+                self.chunks[key] = chunk
 
     def run(self, camera) -> None:
-        """Отрисовывает видимые тайлы уровня."""
-        # Отрисовываем все тайлы через камеру
-        for tile in self.tiles:
-             self.display_surface.blit(tile.image, camera.apply(tile))
\ No newline at end of file
+        """Отрисовывает только чанки, попадающие в область видимости камеры."""
+        if not self.data:
+            return
+        view = camera.view_rect
+        # Диапазон чанков под экраном; число блитов зависит только от размера окна
+        visible = self._chunk_keys(view)
+
+        if self._streamer:
+            # Заказываем видимые чанки и кольцо вокруг экрана, дальние вытесняем
+            chunk_px = self.chunk_px
+            nearby = self._chunk_keys(view.inflate(2 * chunk_px, 2 * chunk_px))
+            self._streamer.request(visible + [key for key in nearby if key not in visible])
+            self._streamer.evict(keep=set(nearby))
+            get_chunk = self._streamer.get
+        else:
+            get_chunk = self.chunks.get
+
+        for key in visible:
+            chunk = get_chunk(key)
+            if chunk is not None:
+                if self._clocks:
+                    self._refresh_chunk(key, chunk)
+                self.display_surface.blit(chunk, camera.apply_rect(self._chunk_area(key)))
@@ -0,0 +1,354 @@
+"""Скомпилированный кэш уровня.
+
+Разбор TMX через pytmx медленный: XML, перебор каждой клетки и загрузка
+всех изображений тайлсетов.  Поэтому карта один раз компилируется в
+бинарный файл рядом с TMX (``tutorial.tmx`` → ``tutorial.lvl``)::
+
+    b"FKLV" | u16 версия | u32 длина заголовка | JSON-заголовок | слои
+
+Заголовок хранит хэш содержимого TMX и его TSX, размеры и начало карты,
+ссылки на изображения тайлов по GID, коллайдабельные GID и анимации
+тайлов (кадры-GID с длительностями из ``<animation>`` тайлсета).  Слои лежат
+подряд как массивы uint32 (little-endian) размером ``width * height``;
+в них сырые GID Tiled вместе с битами отражений.
+
+Данные слоёв декодируются здесь же, сразу в массивы NumPy (CSV через
+``np.fromstring``, base64 через ``np.frombuffer`` после распаковки), без
+списков Python на каждую клетку.  Поэтому поддерживаются и «бесконечные»
+карты Tiled (данные в ``<chunk>``): они сводятся к плотной сетке, а левый
+верхний угол сохраняется как ``origin``.  pytmx разбирает только тайлсеты.
+
+Кэш считается валидным, пока совпадает хэш исходников; иначе уровень
+перекомпилируется и файл перезаписывается.  Если подключён пакет главы
+(``models.asset_pack``), кэш берётся прямо из него: его свежесть пакет
+проверяет сам по времени изменения TMX и TSX, а TMX не читается вовсе.
+"""
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from xml.etree import ElementTree
+
+import numpy as np
+import pytmx
+
+from models.asset_pack import packs
+
+CACHE_SUFFIX = ".lvl"
+_MAGIC = b"FKLV"
+_VERSION = 4
+_GID_DTYPE = np.dtype("<u4")  # порядок байт слоёв в файле
+_HEAD = struct.Struct("<4sHI")
+
+# Тайлы 1 и 2 исторически считаются коллайдабельными без свойства в TSX
+_FORCED_COLLIDABLE = frozenset({1, 2})
+
+
+@dataclass(frozen=True, slots=True)
+class TileRef:
+    """Откуда брать изображение GID: файл, область и отражения."""
+    source: str                                   # путь относительно TMX
+    rect: tuple[int, int, int, int] | None = None  # None — весь файл
+    flip_x: bool = False
+    flip_y: bool = False
+    flip_d: bool = False                          # диагональное отражение Tiled
+    colorkey: str | None = None                   # "rrggbb" из атрибута trans
+
+
+@dataclass(slots=True)
+class CompiledLevel:
+    """Данные уровня без pytmx: сетки GID и таблица тайлов."""
+    width: int
+    height: int
+    tile_size: int
+    layers: list[np.ndarray]      # по слою: uint32, форма (height, width)
+    tiles: dict[int, TileRef]
+    collidable: frozenset[int]
+    root: str = ""                # папка TMX, от неё считаются TileRef.source
+    origin: tuple[int, int] = (0, 0)  # клетка мира, с которой начинается сетка
+    infinite: bool = False
+    # GID → [(GID кадра, длительность в мс), ...]; отражения GID переносятся на кадры
+    animations: dict[int, list[tuple[int, int]]] = field(default_factory=dict)
+
+    def resolve(self, ref: TileRef) -> str:
+        return os.path.join(self.root, ref.source)
+
+
+# ----------------------------------------------------------------- public
+def load_level(tmx_path: str | Path) -> CompiledLevel:
+    """Читает уровень из кэша или компилирует TMX и обновляет кэш."""
+    tmx_path = Path(tmx_path)
+    cache_path = tmx_path.with_suffix(CACHE_SUFFIX)
+
+    packed = packs.read(cache_path)
+    if packed is not None:
+        with packed:
+            level = _parse_cache(packed, tmx_path)
+        if level is not None:
+            return level
+
+    level = _read_cache(cache_path, tmx_path)
+    if level is not None:
+        return level
+
+    level, deps = compile_tmx(tmx_path)
+    try:
+        _write_cache(cache_path, level, _source_hash(tmx_path, deps), deps)
+    except OSError as ex:
+        print(f"Не удалось сохранить кэш уровня {cache_path}: {ex}")
+    return level
+
+
+def level_sources(tmx_path: str | Path) -> list[Path]:
+    """TMX и его TSX — файлы, от которых зависит кэш уровня."""
+    tmx_path = Path(tmx_path)
+    xml_root = ElementTree.parse(tmx_path).getroot()
+    return [tmx_path, *(tmx_path.parent / dep for dep in _tileset_sources(xml_root))]
+
+
+def compile_tmx(tmx_path: str | Path) -> tuple[CompiledLevel, list[str]]:
+    """Разбирает TMX и возвращает уровень и список его TSX."""
+    tmx_path = Path(tmx_path)
+    root = str(tmx_path.parent)
+    xml_root = ElementTree.parse(tmx_path).getroot()
+
+    # Видимые тайловые слои в порядке pytmx (включая вложенные в группы)
+    layer_chunks = [
+        list(_read_layer_chunks(node))
+        for node in xml_root.findall(".//layer")
+        if int(node.get("visible", 1))
+    ]
+    origin, width, height = _bounds(layer_chunks)
+    layers = [_assemble(chunks, origin, width, height) for chunks in layer_chunks]
+
+    # Слои уже прочитаны — pytmx остаются только тайлсеты
+    for parent in xml_root.iter():
+        for child in [c for c in parent if c.tag == "layer"]:
+            parent.remove(child)
+    tmx = pytmx.TiledMap()
+    tmx.filename = str(tmx_path)
+    tmx.parse_xml(xml_root)
+
+    # Регистрируем встреченные GID (с отражениями) и получаем ссылки на картинки:
+    # без image_loader pytmx возвращает images[gid] = (path, rect, flags)
+    used = np.unique(np.concatenate([grid.ravel() for grid in layers] or [np.zeros(0, np.uint32)]))
+    used = [int(raw) for raw in used if raw]
+
+    # Анимации тайлов: pytmx отдаёт кадры своими GID, переводим их обратно в GID
+    # Tiled и добавляем биты отражений анимированной клетки
+    animations: dict[int, list[tuple[int, int]]] = {}
+    for raw in used:
+        props = tmx.get_tile_properties_by_gid(tmx.register_gid(raw & ~pytmx.pytmx.GID_MASK)) or {}
+        if props.get("frames"):
+            flags = raw & pytmx.pytmx.GID_MASK
+            animations[raw] = [
+                (tmx.tiledgidmap[frame.gid] | flags, frame.duration)
+                for frame in props["frames"]
+            ]
+    frame_gids = {gid for frames in animations.values() for gid, _ in frames}
+
+    internal = {raw: tmx.register_gid_check_flags(raw) for raw in set(used) | frame_gids}
+    tmx.reload_images()
+
+    colorkeys = {
+        os.path.join(root, ts.source): ts.trans
+        for ts in tmx.tilesets if ts.source
+    }
+    tiles: dict[int, TileRef] = {}
+    collidable: set[int] = set()
+    for raw, gid in internal.items():
+        ref = tmx.images[gid] if gid < len(tmx.images) else None
+        if not ref:
+            continue
+        path, rect, flags = ref
+        base = raw & ~pytmx.pytmx.GID_MASK
+        # Свойства тайлсета висят на GID без отражений
+        props = tmx.get_tile_properties_by_gid(tmx.register_gid(base)) or {}
+        tiles[raw] = TileRef(
+            source=os.path.relpath(path, root),
+            rect=tuple(rect) if rect else None,
+            flip_x=bool(flags and flags.flipped_horizontally),
+            flip_y=bool(flags and flags.flipped_vertically),
+            flip_d=bool(flags and flags.flipped_diagonally),
+            colorkey=props.get("trans") or colorkeys.get(path),
+        )
+        if props.get("collidable", False) or base in _FORCED_COLLIDABLE:
+            collidable.add(raw)
+
+    level = CompiledLevel(
+        width=width,
+        height=height,
+        tile_size=int(xml_root.get("tilewidth")),
+        layers=layers,
+        tiles=tiles,
+        collidable=frozenset(collidable),
+        root=root,
+        origin=origin,
+        infinite=xml_root.get("infinite") == "1",
+        animations=animations,
+    )
+    return level, _tileset_sources(xml_root)
+
+
+# ---------------------------------------------------------------- intern
+def _read_layer_chunks(node: ElementTree.Element):
+    """Отдаёт (x, y, w, h, gids) для каждого куска данных слоя.
+
+    У конечной карты кусок один — весь слой от (0, 0).
+    """
+    data = node.find("data")
+    encoding, compression = data.get("encoding"), data.get("compression")
+    chunks = data.findall("chunk")
+    if not chunks:
+        w, h = int(node.get("width")), int(node.get("height"))
+        yield 0, 0, w, h, _decode_gids(data.text, encoding, compression, w * h)
+        return
+    for chunk in chunks:
+        w, h = int(chunk.get("width")), int(chunk.get("height"))
+        yield (int(chunk.get("x")), int(chunk.get("y")), w, h,
+               _decode_gids(chunk.text, encoding, compression, w * h))
+
+
+def _decode_gids(text: str, encoding: str | None, compression: str | None, count: int) -> np.ndarray:
+    """Декодирует данные слоя Tiled в плоский массив uint32 длиной count."""
+    if encoding == "csv":
+        # Парсер NumPy на C: переводы строк между рядами он пропускает сам
+        gids = np.fromstring(text, dtype=np.uint32, sep=",")
+    elif encoding == "base64":
+        raw = base64.b64decode(text.strip())
+        if compression == "zlib":
+            raw = zlib.decompress(raw)
+        elif compression == "gzip":
+            raw = gzip.decompress(raw)
+        elif compression:
+            raise ValueError(f"Сжатие слоя {compression!r} не поддерживается")
+        gids = np.frombuffer(raw, dtype=_GID_DTYPE).astype(np.uint32)
+    else:
+        raise ValueError(f"Кодировка слоя {encoding!r} не поддерживается")
+
+    if gids.size != count:
+        raise ValueError(f"В слое {gids.size} клеток вместо {count}")
+    return gids
+
+
+def _bounds(layer_chunks) -> tuple[tuple[int, int], int, int]:
+    """Общая ограничивающая рамка всех кусков: (origin, width, height)."""
+    pieces = [piece for chunks in layer_chunks for piece in chunks]
+    if not pieces:
+        return (0, 0), 0, 0
+    left = min(x for x, _, _, _, _ in pieces)
+    top = min(y for _, y, _, _, _ in pieces)
+    right = max(x + w for x, _, w, _, _ in pieces)
+    bottom = max(y + h for _, y, _, h, _ in pieces)
+    return (left, top), right - left, bottom - top
+
+
+def _assemble(chunks, origin: tuple[int, int], width: int, height: int) -> np.ndarray:
+    """Складывает куски слоя в плотную сетку height x width."""
+    grid = np.zeros((height, width), dtype=np.uint32)
+    for x, y, w, h, gids in chunks:
+        top, left = y - origin[1], x - origin[0]
+        grid[top:top + h, left:left + w] = gids.reshape(h, w)
+    return grid
+
+
+def _tileset_sources(xml_root: ElementTree.Element) -> list[str]:
+    """Внешние TSX карты (пути относительно TMX)."""
+    return [
+        node.get("source")
+        for node in xml_root.iter("tileset")
+        if node.get("source", "").lower().endswith(".tsx")
+    ]
+
+
+def _source_hash(tmx_path: Path, deps: list[str]) -> str:
+    digest = hashlib.sha256(tmx_path.read_bytes())
+    for dep in deps:
+        digest.update(dep.encode("utf-8"))
+        digest.update((tmx_path.parent / dep).read_bytes())
+    return digest.hexdigest()
+
+
+def _write_cache(cache_path: Path, level: CompiledLevel, digest: str, deps: list[str]) -> None:
+    header = json.dumps({
+        "hash": digest,
+        "deps": deps,
+        "width": level.width,
+        "height": level.height,
+        "tile_size": level.tile_size,
+        "origin": level.origin,
+        "infinite": level.infinite,
+        "layers": len(level.layers),
+        "tiles": {
+            gid: [ref.source, ref.rect, ref.flip_x, ref.flip_y, ref.flip_d, ref.colorkey]
+            for gid, ref in level.tiles.items()
+        },
+        "collidable": sorted(level.collidable),
+        "animations": level.animations,
+    }).encode("utf-8")
+
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEAD.pack(_MAGIC, _VERSION, len(header)))
+        f.write(header)
+        for grid in level.layers:
+            f.write(grid.astype(_GID_DTYPE, copy=False).tobytes())
+    os.replace(tmp_path, cache_path)
+
+
+def _read_cache(cache_path: Path, tmx_path: Path) -> CompiledLevel | None:
+    """Возвращает уровень из кэша или None, если кэша нет или он устарел."""
+    try:
+        data = cache_path.read_bytes()
+    except OSError:
+        return None
+    return _parse_cache(data, tmx_path, check_hash=True)
+
+
+def _parse_cache(data: bytes | memoryview, tmx_path: Path, *, check_hash: bool = False) -> CompiledLevel | None:
+    """Разбирает кэш из памяти (файла или среза пакета); None — формат не тот."""
+    try:
+        magic, version, header_len = _HEAD.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            return None
+        header = json.loads(bytes(data[_HEAD.size:_HEAD.size + header_len]))
+        if check_hash and header["hash"] != _source_hash(tmx_path, header["deps"]):
+            return None
+
+        shape = (header["height"], header["width"])
+        cells = shape[0] * shape[1]
+        offset = _HEAD.size + header_len
+        layers = []
+        for _ in range(header["layers"]):
+            # Копия: сетки живут дольше буфера (mmap пакета может закрыться)
+            grid = np.frombuffer(data, dtype=_GID_DTYPE, count=cells, offset=offset)
+            layers.append(grid.astype(np.uint32).reshape(shape))
+            offset += cells * _GID_DTYPE.itemsize
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+    return CompiledLevel(
+        width=header["width"],
+        height=header["height"],
+        tile_size=header["tile_size"],
+        layers=layers,
+        tiles={
+            int(gid): TileRef(src, tuple(rect) if rect else None, fx, fy, fd, key)
+            for gid, (src, rect, fx, fy, fd, key) in header["tiles"].items()
+        },
+        collidable=frozenset(header["collidable"]),
+        root=str(tmx_path.parent),
+        origin=tuple(header["origin"]),
+        infinite=header["infinite"],
+        animations={
+            int(gid): [tuple(frame) for frame in frames]
+            for gid, frames in header["animations"].items()
+        },
+    )
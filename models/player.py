@@ -1,10 +1,12 @@
 from __future__ import annotations
+import json
 import random
 from pathlib import Path
 from enum import Enum, auto
 import pygame as pg
 from models.character import Character
-from models.animation import Animation
+from models.animation import Animation, animation_clock
+from models.resources import resources
 from models.constants import BASE_SPEED, SPRINT_MULT, GRAVITY, JUMP_SPEED, MAX_FALL_SPEED, DOUBLE_CLICK_MS
 from models.skill import SkillManager, FireballSkill, ShieldSkill, HealSkill, BlinkSkill
 
@@ -32,14 +34,24 @@ _ANIM_INFO = {
     PState.DEATH:   ("death",       12, False),
 }
 
+# Состояния, в которых кадр игрока наносит удар
+ATTACK_STATES = frozenset({PState.ATTACK1, PState.ATTACK2, PState.HEAVY})
+
+HERO_ASSETS = Path("assets/images/hero_knight")
+# Атлас кадров собирается offline: python -m tools.pack_atlas
+ATLAS_MANIFEST = HERO_ASSETS / "atlas.json"
+FRAME_SIZE = (128, 128)  # размер кадра спрайта игрока
+PLACEHOLDER_IMAGE = HERO_ASSETS / "placeholder.png"
+
 class Player(Character):
     """Класс игрока, включает движение, действия и анимационные состояния."""
     def __init__(self, x: int, y: int, health: int = 100) -> None:
         # Инициализируем персонажа с placeholder изображением (будет заменено анимацией)
-        super().__init__("assets/images/hero_knight/placeholder.png", x, y, health=health)
+        super().__init__(PLACEHOLDER_IMAGE, x, y, health=health)
         # Масштабируем спрайт-заглушку игрока до 128x128
         self.image = pg.transform.scale(self.image, (128, 128))
         self.rect = self.image.get_rect(center=self.rect.center)
+        self.image_offset = (0, 0)  # где рисовать обрезанный кадр относительно rect.topleft
         self._state = PState.IDLE
         # Загружаем все анимации из папок ассетов
         self._animations = self._load_animations()
@@ -113,6 +125,28 @@ class Player(Character):
             return self.skill_manager.use_skill_by_key(key, self)
         return False
 
+    # ---------------- Попадания ----------------
+    def current_mask(self) -> tuple[pg.mask.Mask, tuple[int, int]]:
+        """Маска текущего кадра и её левый верхний угол в мире.
+
+        Маски построены при загрузке анимаций, здесь ничего не создаётся.
+        """
+        mask = self._animations[self._state].mask(flip_x=self._face_left)
+        ox, oy = self.image_offset
+        return mask, (self.rect.x + ox, self.rect.y + oy)
+
+    def attack_mask(self) -> tuple[pg.mask.Mask, tuple[int, int]] | None:
+        """Маска удара: текущий кадр в атакующих состояниях, иначе None."""
+        return self.current_mask() if self._state in ATTACK_STATES else None
+
+    def hits(self, mask: pg.mask.Mask, pos: tuple[int, int]) -> bool:
+        """Пиксельное попадание удара игрока по маске ``mask`` в мировой точке ``pos``."""
+        attack = self.attack_mask()
+        if attack is None:
+            return False
+        own, (x, y) = attack
+        return own.overlap(mask, (pos[0] - x, pos[1] - y)) is not None
+
     def get_speed(self) -> float:
         """Возвращает текущую скорость игрока."""
         return BASE_SPEED * (SPRINT_MULT if self._sprint_on else 1)
@@ -127,12 +161,13 @@ class Player(Character):
         elif self.vel_x > 0:
             self._face_left = False
 
-        # Обновляем изображение
-        self.image = self._animations[self._state].update(flip_x=self._face_left)
+        # Обновляем изображение: кадр обрезан до видимых пикселей, сдвиг — отдельно
+        animation = self._animations[self._state]
+        self.image = animation.update(flip_x=self._face_left)
+        self.image_offset = animation.offset(flip_x=self._face_left)
 
-        # Обновляем скиллы
-        dt = 1 / 60  # TODO: Использовать реальное время кадра
-        self.skill_manager.update(dt)
+        # Обновляем скиллы по игровому времени кадра (общие часы анимаций)
+        self.skill_manager.update(animation_clock.dt)
 
     # ---------------- Методы управления ресурсами ----------------
     def add_coin(self, amount: int = 1) -> None:
@@ -220,21 +255,53 @@ class Player(Character):
         elif self.right_down and not self.left_down:
             self.vel_x = 1
 
+    @staticmethod
+    def asset_paths() -> list[Path]:
+        """Файлы, которые декодирует конструктор игрока (для предзагрузки)."""
+        paths = [PLACEHOLDER_IMAGE] if PLACEHOLDER_IMAGE.exists() else []
+        try:
+            with open(ATLAS_MANIFEST, encoding="utf-8") as f:
+                return paths + [ATLAS_MANIFEST.parent / json.load(f)["image"]]
+        except (OSError, ValueError, KeyError):
+            return paths + sorted(HERO_ASSETS.glob("*/*.png"))
+
     @staticmethod
     def _load_frames_from_folder(path: Path) -> list[pg.Surface]:
         """Загрузить и масштабировать все кадры анимации из указанной папки."""
         frames = []
         for img_path in sorted(path.glob("*.png")):
-            frame = pg.image.load(img_path).convert_alpha()
-            frame = pg.transform.scale(frame, (128, 128))
-            frames.append(frame)
+            frames.append(resources.image(img_path, size=FRAME_SIZE))
         return frames
 
+    @staticmethod
+    def _load_atlas(manifest_path: Path) -> dict[str, list[pg.Surface]] | None:
+        """Кадры всех состояний из атласа: одно декодирование и subsurface на кадр."""
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            atlas_path = manifest_path.parent / manifest["image"]
+            scale = manifest.get("scale", 1)
+            atlas = resources.image(atlas_path)
+            if scale != 1:
+                # Атлас в исходном разрешении: увеличиваем целиком одним вызовом
+                w, h = atlas.get_size()
+                atlas = resources.image(atlas_path, size=(w * scale, h * scale))
+            return {
+                name: [atlas.subsurface([v * scale for v in frame["rect"]]) for frame in anim["frames"]]
+                for name, anim in manifest["animations"].items()
+            }
+        except (OSError, ValueError, KeyError, pg.error) as e:
+            print(f"Ошибка загрузки атласа {manifest_path}: {e}")
+            return None
+
     def _load_animations(self) -> dict[PState, Animation]:
         """Загрузить последовательности кадров для всех состояний игрока."""
-        base_path = Path("assets/images/hero_knight")
+        atlas = self._load_atlas(ATLAS_MANIFEST) or {}
         animations: dict[PState, Animation] = {}
         for state, (folder, fps, loop) in _ANIM_INFO.items():
-            frames = self._load_frames_from_folder(base_path / folder)
-            animations[state] = Animation(frames, fps, loop=loop)
+            # Состояния, которых нет в атласе, грузим по старинке из папки
+            frames = atlas.get(state.name) or self._load_frames_from_folder(HERO_ASSETS / folder)
+            animations[state] = Animation(frames, fps, loop=loop, masks=True)
         return animations
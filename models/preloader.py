@@ -0,0 +1,117 @@
+"""Параллельная предзагрузка ресурсов.
+
+Декодирование PNG и звуков (zlib, MP3/OGG) идёт в пуле потоков — pygame
+отпускает GIL на время разбора файла, поэтому на многоядерной машине
+файлы декодируются одновременно.  Если задан размер, там же картинка и
+масштабируется.  ``convert``/``convert_alpha`` зависят
+от дисплея и делаются в главном потоке в ``poll``, понемногу за кадр,
+чтобы окно оставалось отзывчивым.  Готовое кладётся в общий кэш
+``models.resources``, откуда его затем берут сцены.
+
+Музыка (``pg.mixer.music``) потоковая и не предзагружается.  Картинки,
+запечённые ``tools.bake_assets``, тоже пропускаются: сырые пиксели
+читаются быстрее, чем отрабатывает пул.
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+import pygame as pg
+
+from models.baked_assets import baked_assets
+from models.asset_pack import packs
+from models.resources import ResourceCache, decode_image, load_sound, resources
+
+# Картинка для предзагрузки: (путь, alpha) или (путь, alpha, размер)
+ImageJob = tuple[str | Path, bool] | tuple[str | Path, bool, tuple[int, int] | None]
+
+
+class Preloader:
+    """Загружает набор изображений и звуков в фоне и сообщает прогресс."""
+
+    def __init__(self, images: Iterable[ImageJob] = (), sounds: Iterable[str | Path] = (),
+                 *, cache: ResourceCache = resources, workers: int | None = None) -> None:
+        """``images`` — (путь, alpha[, размер]): alpha выбирает convert_alpha()/convert(),
+        размер — под каким его запросят у кэша (масштабируется здесь же, в потоке)."""
+        self.cache = cache
+        self.errors: list[tuple[str, Exception]] = []
+        # Задания: (вид, путь, alpha, размер, future).  Уже закэшированное и запечённое
+        # исходное пропускаем, как и отсутствующие файлы: заглушки для них рисуют сами сцены
+        self._jobs: list[tuple[str, str, bool, tuple[int, int] | None, Future]] = []
+        images = [(os.fspath(path), alpha, size) for path, alpha, size
+                  in dict.fromkeys((*job, None)[:3] for job in images)
+                  if packs.exists(path) and not cache.has_image(path, size=size, alpha=alpha)
+                  and not (size is None and baked_assets.has(path, alpha=alpha))]
+        sounds = [os.fspath(path) for path in dict.fromkeys(sounds)
+                  if packs.exists(path) and not cache.has_sound(path)]
+        self.total = len(images) + len(sounds)
+        self.done = 0
+        if not self.total:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1),
+                                  thread_name_prefix="preload")
+        self._jobs += [("image", path, alpha, size, pool.submit(decode_image, path, size, alpha=alpha))
+                       for path, alpha, size in images]
+        if pg.mixer.get_init():
+            self._jobs += [("sound", path, False, None, pool.submit(load_sound, path)) for path in sounds]
+        else:
+            self.total -= len(sounds)  # без микшера звуки не декодировать
+        pool.shutdown(wait=False)  # пул закроется, когда доделает задания
+
+    # ---------------------------------------------------------------- public
+    @property
+    def progress(self) -> float:
+        """Доля готового от 0 до 1."""
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.total
+
+    def poll(self, budget_ms: float = 8.0) -> float:
+        """Принимает готовые файлы в кэш, тратя не больше ``budget_ms`` за вызов.
+
+        Вызывать из главного потока каждый кадр; возвращает прогресс.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        pending = []
+        for job in self._jobs:
+            if not job[-1].done() or time.perf_counter() > deadline:
+                pending.append(job)
+                continue
+            self._accept(*job)
+        self._jobs = pending
+        return self.progress
+
+    def wait(self) -> None:
+        """Дожидается всех файлов (когда показывать экран загрузки не нужно)."""
+        for job in self._jobs:
+            job[-1].exception()  # блокирует до завершения задания
+        self.poll(budget_ms=float("inf"))
+
+    def cancel(self) -> None:
+        """Отменяет ещё не начатые задания."""
+        for job in self._jobs:
+            job[-1].cancel()
+        self._jobs = []
+        self.done = self.total
+
+    # ---------------------------------------------------------------- intern
+    def _accept(self, kind: str, path: str, alpha: bool, size: tuple[int, int] | None, future: Future) -> None:
+        self.done += 1
+        try:
+            result = future.result()
+        except (pg.error, OSError) as e:
+            # Сцена потом сама покажет заглушку, как при обычной загрузке
+            print(f"Ошибка предзагрузки {path}: {e}")
+            self.errors.append((path, e))
+            return
+        if kind == "image":
+            self.cache.add_image(path, result, size=size, alpha=alpha)
+        else:
+            self.cache.add_sound(path, result)
@@ -0,0 +1,221 @@
+"""Общий кэш ресурсов: изображения, звуки и шрифты.
+
+Ключ записи — путь плюс преобразование (размер, отражения, формат
+пикселей), поэтому масштабированная копия тоже кэшируется и не строится
+заново при каждом создании сцены.  Объём ограничен бюджетом в байтах:
+при переполнении вытесняются давно не использованные записи (LRU).
+
+Возвращаемые объекты общие — менять их на месте нельзя (``set_alpha``,
+рисование поверх и т. п.); для этого делайте ``copy()``.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pygame as pg
+
+from models.asset_pack import packs
+from models.baked_assets import baked_assets
+from models.constants import RESOURCE_BUDGET_BYTES
+from models.display_format import display_format
+
+ResourceKey = tuple
+
+
+class ResourceCache:
+    """LRU-кэш загруженных ресурсов с бюджетом памяти и статистикой."""
+
+    def __init__(self, budget_bytes: int) -> None:
+        self.budget_bytes = budget_bytes
+        self.bytes_used = 0
+        self.hits = self.misses = self.evictions = 0
+        # Запись: ключ -> (ресурс, размер в байтах); LRU слева
+        self._entries: OrderedDict[ResourceKey, tuple[object, int]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    # ---------------------------------------------------------------- public
+    def image(self, path: str | Path, *, size: tuple[int, int] | None = None,
+              flip_x: bool = False, flip_y: bool = False, alpha: bool = True) -> pg.Surface:
+        """Изображение из файла, при необходимости масштабированное и отражённое.
+
+        ``alpha`` выбирает convert_alpha() или convert().  Ошибки загрузки
+        (FileNotFoundError, pg.error) пробрасываются вызывающему коду.
+        """
+        key = ("image", os.fspath(path), tuple(size) if size else None, flip_x, flip_y, alpha)
+        with self._lock:
+            surface = self._get(key)
+            if surface is not None:
+                return surface
+            if flip_x or flip_y:
+                # Отражённое строим из закэшированного изображения того же размера
+                surface = pg.transform.flip(self.image(path, size=size, alpha=alpha), flip_x, flip_y)
+            elif (surface := baked_assets.load(path, size, alpha=alpha)) is not None:
+                # Заранее масштабированная копия (tools.bake_assets): без PNG и scale
+                surface = surface.convert_alpha() if alpha else surface.convert()
+            elif size:
+                # Производное изображение строим из закэшированного исходника
+                surface = pg.transform.scale(self.image(path, alpha=alpha), size)
+            else:
+                surface = load_image(path)
+                surface = surface.convert_alpha() if alpha else surface.convert()
+            self._put(key, surface, surface.get_pitch() * surface.get_height())
+            return surface
+
+    def sound(self, path: str | Path) -> pg.mixer.Sound:
+        """Декодированный звук из файла."""
+        key = ("sound", os.fspath(path))
+        with self._lock:
+            sound = self._get(key)
+            if sound is None:
+                sound = load_sound(path)
+                self._put(key, sound, _sound_bytes(sound))
+            return sound
+
+    def font(self, path: str | Path | None, size: int) -> pg.font.Font:
+        """Шрифт из файла; None — встроенный шрифт pygame."""
+        key = ("font", os.fspath(path) if path else None, size)
+        with self._lock:
+            font = self._get(key)
+            if font is None:
+                font = pg.font.Font(path, size)
+                self._put(key, font, os.path.getsize(path) if path else 0)
+            return font
+
+    def sysfont(self, name: str | None, size: int) -> pg.font.Font:
+        """Системный шрифт (как ``pg.font.SysFont``)."""
+        key = ("sysfont", name, size)
+        with self._lock:
+            font = self._get(key)
+            if font is None:
+                font = pg.font.SysFont(name, size)
+                self._put(key, font, 0)
+            return font
+
+    # ------------------------------------------------- предзагрузка (preloader)
+    def has_image(self, path: str | Path, *, size: tuple[int, int] | None = None, alpha: bool = True) -> bool:
+        """Есть ли в кэше изображение такого размера (без учёта статистики)."""
+        key = ("image", os.fspath(path), tuple(size) if size else None, False, False, alpha)
+        with self._lock:
+            return key in self._entries
+
+    def has_sound(self, path: str | Path) -> bool:
+        with self._lock:
+            return ("sound", os.fspath(path)) in self._entries
+
+    def add_image(self, path: str | Path, surface: pg.Surface, *,
+                  size: tuple[int, int] | None = None, alpha: bool = True) -> pg.Surface:
+        """Кладёт декодированное где-то ещё изображение; конвертирует его здесь.
+
+        ``size`` — под каким размером его потом запросят (уже масштабированное).
+        Вызывать из главного потока: convert()/convert_alpha() зависят от дисплея.
+        """
+        surface = surface.convert_alpha() if alpha else surface.convert()
+        key = ("image", os.fspath(path), tuple(size) if size else None, False, False, alpha)
+        with self._lock:
+            self._put(key, surface, surface.get_pitch() * surface.get_height())
+        return surface
+
+    def discard_sound(self, path: str | Path) -> None:
+        """Выгружает звук, который больше не понадобится (например, озвучку прошлой реплики)."""
+        with self._lock:
+            entry = self._entries.pop(("sound", os.fspath(path)), None)
+            if entry is not None:
+                self.bytes_used -= entry[1]
+
+    def add_sound(self, path: str | Path, sound: pg.mixer.Sound) -> None:
+        """Кладёт звук, декодированный в другом потоке."""
+        with self._lock:
+            self._put(("sound", os.fspath(path)), sound, _sound_bytes(sound))
+
+    def stats(self) -> dict[str, int | float]:
+        """Счётчики попаданий/промахов и занятая память."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes_used,
+            }
+
+    def reconvert(self) -> None:
+        """Приводит закэшированные изображения к формату нового окна."""
+        with self._lock:
+            for key, (value, _) in list(self._entries.items()):
+                if key[0] == "image":
+                    surface = value.convert_alpha() if key[-1] else value.convert()
+                    self._entries[key] = (surface, surface.get_pitch() * surface.get_height())
+            self.bytes_used = sum(size for _, size in self._entries.values())
+
+    def clear(self) -> None:
+        """Забывает все ресурсы (например, после смены видеорежима)."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    # ---------------------------------------------------------------- intern
+    def _get(self, key: ResourceKey):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _put(self, key: ResourceKey, value: object, size: int) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= old[1]
+        self._entries[key] = (value, size)
+        self.bytes_used += size
+        # Вытесняем самые старые записи, но только что добавленную оставляем
+        while self.bytes_used > self.budget_bytes and len(self._entries) > 1:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self.bytes_used -= old_size
+            self.evictions += 1
+
+
+def load_image(path: str | Path) -> pg.Surface:
+    """Декодирует изображение из пакета главы или с диска (можно из потока)."""
+    with packs.open(path) as f:
+        return pg.image.load(f, os.fspath(path))
+
+
+def decode_image(path: str | Path, size: tuple[int, int] | None = None, *, alpha: bool = True) -> pg.Surface:
+    """Изображение нужного размера без convert() — для фоновых потоков.
+
+    Берёт запечённую копию, если она есть, иначе декодирует и масштабирует;
+    пиксели те же, что у ``ResourceCache.image``.
+    """
+    surface = baked_assets.load(path, size, alpha=alpha)
+    if surface is None:
+        surface = load_image(path)
+        if size:
+            surface = pg.transform.scale(surface, size)
+    return surface
+
+
+def load_sound(path: str | Path) -> pg.mixer.Sound:
+    """Декодирует звук из пакета главы или с диска (можно из потока)."""
+    with packs.open(path) as f:
+        return pg.mixer.Sound(file=f)
+
+
+def _sound_bytes(sound: pg.mixer.Sound) -> int:
+    init = pg.mixer.get_init()
+    if not init:
+        return 0
+    frequency, fmt, channels = init
+    return int(sound.get_length() * frequency) * channels * (abs(fmt) // 8)
+
+
+# Общий экземпляр на всю игру; подписан первым, чтобы остальные после смены
+# видеорежима брали из кэша уже переконвертированные изображения
+resources = ResourceCache(RESOURCE_BUDGET_BYTES)
+display_format.listen(resources.reconvert)
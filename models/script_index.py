@@ -0,0 +1,180 @@
+"""Скомпилированный индекс сценария.
+
+Сценарий главы с тысячами реплик и ветвлений долго разбирать целиком при
+каждом входе в главу.  Поэтому он один раз индексируется: для каждой
+реплики запоминаются байтовые границы её объекта в ``story.json`` (или её
+строки в ``story.txt``).  Индекс лежит рядом со сценарием
+(``story.json`` → ``story.json.idx``)::
+
+    b"FKSI" | u16 версия | u64 размер | i64 mtime_ns | sha256 | u32 реплик | [u64 начало, u64 конец] * N
+
+Сценарий и индекс отображаются в память (``mmap``), поэтому открытие главы
+не зависит от длины сценария: реплика декодируется, только когда её
+запросят (``DialogModel.get``).
+
+Индекс действителен, пока совпадают размер и время изменения сценария.
+Если они другие, сверяется хэш содержимого: файл лишь «потрогали»
+(checkout, копирование) — в индексе обновляется заголовок, иначе индекс
+строится заново.  Если подключён пакет главы (``models.asset_pack``),
+индекс берётся из него вместе со сценарием: их свежесть пакет проверяет
+по одному и тому же исходнику.
+
+Модуль не зависит от Pygame.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from models.asset_pack import packs
+
+INDEX_SUFFIX = ".idx"
+_MAGIC = b"FKSI"
+_VERSION = 1
+_HEAD = struct.Struct("<4sHQq32sI")
+_OFFSET_DTYPE = np.dtype("<u8")  # порядок байт границ в файле
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Данные сценария: отображённый файл, срез пакета или b"" для пустого файла
+ScriptData = mmap.mmap | memoryview | bytes
+
+
+# ----------------------------------------------------------------- public
+def index_path(script_path: str | Path) -> Path:
+    """Где лежит индекс сценария."""
+    script_path = Path(script_path)
+    return script_path.with_name(script_path.name + INDEX_SUFFIX)
+
+
+def open_script(script_path: str | Path) -> tuple[ScriptData, np.ndarray] | None:
+    """Данные сценария и границы реплик (массив формы (N, 2)); None — файла нет."""
+    script_path = Path(script_path)
+
+    packed = packs.read(script_path)
+    if packed is not None:
+        index = _parse_index(packs.read(index_path(script_path)))
+        if index is not None and index[0] == len(packed):
+            return packed, index[3]
+        return packed, build_index(packed, script_path.suffix)  # собран без индекса
+
+    try:
+        data = _map_file(script_path)
+    except FileNotFoundError:
+        return None
+    return data, load_index(script_path, data)
+
+
+def load_index(script_path: Path, data: ScriptData) -> np.ndarray:
+    """Границы реплик из индекса на диске; устаревший индекс перестраивается."""
+    st = os.stat(script_path)
+    idx_path = index_path(script_path)
+    try:
+        index = _parse_index(_map_file(idx_path))
+    except OSError:
+        index = None
+    if index is not None and index[0] == st.st_size and index[1] == st.st_mtime_ns:
+        return index[3]
+
+    digest = hashlib.sha256(data).digest()
+    if index is not None and index[0] == len(data) and index[2] == digest:
+        offsets = index[3].copy()  # содержимое то же — обновим только заголовок
+    else:
+        offsets = build_index(data, script_path.suffix)
+    try:
+        _write_index(idx_path, st, digest, offsets)
+    except OSError as ex:
+        print(f"Не удалось сохранить индекс сценария {idx_path}: {ex}")
+    return offsets
+
+
+def build_index(data: ScriptData, suffix: str) -> np.ndarray:
+    """Размечает сценарий: ``.json`` — по объектам массива, иначе по строкам."""
+    spans = _json_spans(bytes(data)) if suffix == ".json" else _line_spans(data)
+    return np.asarray(spans, dtype=np.uint64).reshape(-1, 2)
+
+
+# ----------------------------------------------------------------- intern
+def _json_spans(raw: bytes) -> list[tuple[int, int]]:
+    """Границы объектов верхнего массива; каждый разбирается один раз при сборке."""
+    text = raw.decode("utf-8")
+    decoder = json.JSONDecoder()
+    ascii_only = len(text) == len(raw)
+    char_pos = byte_pos = 0
+
+    def to_byte(pos: int) -> int:
+        # raw_decode считает в символах, а индекс хранит байты файла
+        nonlocal char_pos, byte_pos
+        if ascii_only:
+            return pos
+        byte_pos += len(text[char_pos:pos].encode("utf-8"))
+        char_pos = pos
+        return byte_pos
+
+    pos = _WHITESPACE.match(text).end()
+    if not text.startswith("[", pos):
+        raise ValueError("сценарий должен быть JSON-массивом реплик")
+    pos = _WHITESPACE.match(text, pos + 1).end()
+    spans: list[tuple[int, int]] = []
+    if text.startswith("]", pos):
+        return spans
+    while True:
+        item, end = decoder.raw_decode(text, pos)
+        if not isinstance(item, dict):
+            raise ValueError(f"реплика {len(spans)} должна быть объектом")
+        spans.append((to_byte(pos), to_byte(end)))
+        pos = _WHITESPACE.match(text, end).end()
+        if text.startswith("]", pos):
+            return spans
+        if not text.startswith(",", pos):
+            raise ValueError(f"ожидается ',' или ']' в позиции {pos}")
+        pos = _WHITESPACE.match(text, pos + 1).end()
+
+
+def _line_spans(data: ScriptData) -> np.ndarray:
+    """Границы строк (вместе с переводом строки), как их перебирает ``for line in f``."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw == ord("\n")) + 1
+    if len(raw) and (not len(ends) or ends[-1] != len(raw)):
+        ends = np.append(ends, len(raw))  # последняя строка без перевода строки
+    starts = np.concatenate(([0], ends))[:-1]
+    return np.stack([starts, ends], axis=1)
+
+
+def _map_file(path: Path) -> ScriptData:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # пустой файл отобразить нельзя
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_index(data: ScriptData | None) -> tuple[int, int, bytes, np.ndarray] | None:
+    """(размер, mtime_ns, sha256, границы) из индекса; None — формат не тот."""
+    if data is None:
+        return None
+    try:
+        magic, version, size, mtime_ns, digest, count = _HEAD.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            return None
+        # Без копирования: массив держит отображение индекса открытым
+        offsets = np.frombuffer(data, dtype=_OFFSET_DTYPE, count=count * 2, offset=_HEAD.size)
+    except (ValueError, struct.error):
+        return None
+    offsets = offsets.reshape(count, 2)
+    if count and int(offsets[-1, 1]) > size:
+        return None
+    return size, mtime_ns, digest, offsets
+
+
+def _write_index(idx_path: Path, st: os.stat_result, digest: bytes, offsets: np.ndarray) -> None:
+    tmp_path = idx_path.with_name(idx_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEAD.pack(_MAGIC, _VERSION, st.st_size, st.st_mtime_ns, digest, len(offsets)))
+        f.write(offsets.astype(_OFFSET_DTYPE).tobytes())
+    os.replace(tmp_path, idx_path)
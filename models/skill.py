@@ -5,6 +5,9 @@ import pygame as pg
 from enum import Enum, auto
 from typing import Dict, Optional, Tuple, List
 
+from models.resources import resources
+from models.display_format import display_format, reconvert
+
 class SkillType(Enum):
     """Типы скиллов."""
     ATTACK = auto()    # Атакующий скилл
@@ -33,16 +36,21 @@ class Skill:
         
         # Загружаем иконку
         try:
-            self.icon = pg.image.load(icon_path).convert_alpha()
+            self.icon = resources.image(icon_path)
         except (FileNotFoundError, pg.error):
             # Создаем заглушку, если файл не найден
             self.icon = self._create_placeholder_icon()
+        display_format.listen(self._reconvert_icon)
         
         # Состояние скилла
         self.remaining_cooldown = 0.0
         self.last_used_time = 0
         self.is_equipped = False
         
+    def _reconvert_icon(self) -> None:
+        """Иконка в формате нового окна (после смены видеорежима)."""
+        self.icon = reconvert(self.icon)
+
     def _create_placeholder_icon(self) -> pg.Surface:
         """Создает временное изображение для иконки скилла."""
         surface = pg.Surface((64, 64), pg.SRCALPHA)
@@ -60,7 +68,7 @@ class Skill:
         pg.draw.rect(surface, color, (0, 0, 64, 64), border_radius=10)
         
         # Добавляем первую букву имени скилла
-        font = pg.font.Font(None, 40)
+        font = resources.font(None, 40)
         text = font.render(self.name[0].upper(), True, (255, 255, 255))
         text_rect = text.get_rect(center=(32, 32))
         surface.blit(text, text_rect)
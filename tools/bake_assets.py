@@ -0,0 +1,207 @@
+"""Запекание изображений в заранее масштабированный сырой кэш.
+
+Запуск из корня проекта::
+
+    python -m tools.bake_assets [--screen 1920x1080 ...]
+
+Обходит ``assets/`` и для каждой картинки пишет в ``BAKED_ASSETS_DIR``
+сырые пиксели в тех размерах, в которых её просит игра:
+
+* все PNG — в исходном размере (тайлсеты, иконки скиллов, исходники фонов);
+* кадры героя и заглушка — ``FRAME_SIZE``, атлас — увеличенный в ``scale`` раз;
+* картинки HUD — размеры из ``views.hud``;
+* фоны меню и сюжетные картинки — под каждый размер экрана, портреты
+  диалогов — ``views.dialog_view.PORTRAIT_SIZE``.
+
+Размеры экрана: 960x540 (запасное окно), окно из ``config.json``,
+разрешения мониторов и всё, что передано через ``--screen``.
+
+Масштабирование то же, что в ``ResourceCache.image``, так что пиксели
+совпадают с загрузкой из PNG.  Файл кэша называется по хэшу содержимого
+исходника и целевого формата: при повторном запуске неизменённые картинки
+не пересобираются, а лишние файлы удаляются.  После правки ассетов утилиту
+нужно запустить снова — до этого игра грузит изменённые PNG как раньше.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pygame as pg
+
+from models.baked_assets import MANIFEST_NAME, MANIFEST_VERSION, asset_key
+from models.config import Config
+from models.constants import BAKED_ASSETS_DIR
+from models.dialog import DialogModel
+from models.player import ATLAS_MANIFEST, FRAME_SIZE, HERO_ASSETS, PLACEHOLDER_IMAGE
+from views.dialog_view import DEFAULT_PORTRAIT, PORTRAIT_SIZE
+from views.hud import HUD_IMAGES, HEART_SIZE, ICON_SIZE, PORTRAIT_SIZE as HUD_PORTRAIT_SIZE
+from views.menu_view import BG_IMAGES
+
+ASSETS_ROOT = Path("assets")
+FALLBACK_SCREEN = (960, 540)  # окно, которое создаётся при ошибке видеорежима
+HUD_SIZES = {
+    "portrait": HUD_PORTRAIT_SIZE,
+    "heart_full": HEART_SIZE,
+    "heart_empty": HEART_SIZE,
+    "coin": ICON_SIZE,
+    "mana": ICON_SIZE,
+}
+
+Target = tuple[Path, "tuple[int, int] | None", bool]  # путь, размер, alpha
+
+
+def screen_sizes(extra: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Размеры экрана, под которые масштабируются фоны и сюжетные картинки."""
+    sizes = [FALLBACK_SCREEN, Config().window_size, *pg.display.get_desktop_sizes(), *extra]
+    return list(dict.fromkeys(tuple(size) for size in sizes))
+
+
+def collect_targets(screens: list[tuple[int, int]]) -> dict[str, Target]:
+    """Все пары (картинка, размер), которые игра загружает через ``resources.image``."""
+    targets: dict[str, Target] = {}
+
+    def add(path: str | Path, size: tuple[int, int] | None = None, alpha: bool = True) -> None:
+        if os.path.exists(path):
+            targets[asset_key(path, size, alpha)] = (Path(path), size, alpha)
+
+    baked_root = Path(BAKED_ASSETS_DIR).resolve()
+    opaque = {Path(path).resolve() for path in BG_IMAGES}
+    for path in sorted(ASSETS_ROOT.rglob("*.png")):
+        resolved = path.resolve()
+        if baked_root not in resolved.parents and resolved not in opaque:
+            add(path)
+
+    # Герой: заглушка, кадры из папок и атлас
+    add(PLACEHOLDER_IMAGE, FRAME_SIZE)
+    for path in sorted(HERO_ASSETS.glob("*/*.png")):
+        add(path, FRAME_SIZE)
+    try:
+        with open(ATLAS_MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+        atlas_path = ATLAS_MANIFEST.parent / manifest["image"]
+        scale = manifest.get("scale", 1)
+        if scale != 1:
+            w, h = pg.image.load(atlas_path).get_size()
+            add(atlas_path, (w * scale, h * scale))
+    except (OSError, ValueError, KeyError, pg.error) as e:
+        print(f"Атлас героя пропущен: {e}")
+
+    for name, path in HUD_IMAGES.items():
+        add(path, HUD_SIZES[name])
+
+    # Фоны меню непрозрачные (convert()), как в MenuView
+    for path in BG_IMAGES:
+        add(path, alpha=False)
+        for size in screens:
+            add(path, size, alpha=False)
+
+    add(DEFAULT_PORTRAIT, PORTRAIT_SIZE)
+    for chapter in sorted(ASSETS_ROOT.glob("chapters/*/")):
+        for entry in DialogModel(f"{chapter.as_posix()}/").entries:
+            if entry.image:
+                for size in screens:
+                    add(entry.image, size)
+            if entry.portrait:
+                add(entry.portrait, PORTRAIT_SIZE)
+    return targets
+
+
+def bake(targets: dict[str, Target], root: Path = Path(BAKED_ASSETS_DIR)) -> tuple[int, int, int]:
+    """Пишет недостающие файлы и манифест; возвращает (запечено, готово, удалено)."""
+    root.mkdir(parents=True, exist_ok=True)
+    hashes: dict[Path, str] = {}
+    sources: dict[tuple[Path, bool], pg.Surface] = {}
+    entries: dict[str, dict] = {}
+    baked = reused = 0
+    # Размеры уже запечённых файлов — из прошлого манифеста (чтобы не декодировать PNG)
+    known_sizes = {entry["file"]: entry["size"] for entry in _read_entries(root)}
+
+    for key, (path, size, alpha) in targets.items():
+        if path not in hashes:
+            hashes[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+        fmt = "RGBA" if alpha else "RGB"
+        name = hashlib.sha256(f"{hashes[path]}|{size}|{fmt}".encode()).hexdigest() + ".raw"
+        if (root / name).exists() and name in known_sizes:
+            reused += 1
+            pixels = tuple(known_sizes[name])
+        else:
+            # Как в ResourceCache.image: convert/convert_alpha, затем scale
+            if (path, alpha) not in sources:
+                source = pg.image.load(path)
+                sources[path, alpha] = source.convert_alpha() if alpha else source.convert()
+            surface = sources[path, alpha]
+            if size:
+                surface = pg.transform.scale(surface, size)
+            tmp_path = root / (name + ".tmp")
+            tmp_path.write_bytes(pg.image.tobytes(surface, fmt))
+            os.replace(tmp_path, root / name)
+            baked += 1
+            pixels = surface.get_size()
+        st = path.stat()
+        entries[key] = {
+            "file": name,
+            "size": list(pixels),
+            "source_sha256": hashes[path],
+            "source_size": st.st_size,
+            "source_mtime_ns": st.st_mtime_ns,
+        }
+
+    # Файлы, на которые больше нет ссылок (старые версии картинок)
+    used = {entry["file"] for entry in entries.values()}
+    removed = 0
+    for stale in root.glob("*.raw"):
+        if stale.name not in used:
+            stale.unlink()
+            removed += 1
+
+    tmp_path = root / (MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, root / MANIFEST_NAME)
+    return baked, reused, removed
+
+
+def _read_entries(root: Path) -> list[dict]:
+    try:
+        with open(root / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if manifest.get("version") != MANIFEST_VERSION:
+        return []
+    return list(manifest.get("entries", {}).values())
+
+
+def _size_arg(value: str) -> tuple[int, int]:
+    try:
+        w, h = (int(v) for v in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается ШИРИНАxВЫСОТА, получено {value!r}")
+    return w, h
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tools.bake_assets",
+                                     description="Заранее масштабирует картинки игры в сырой кэш.")
+    parser.add_argument("--screen", type=_size_arg, action="append", default=[],
+                        help="дополнительный размер экрана, например 2560x1440")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.init()
+    pg.display.set_mode((1, 1))  # convert()/convert_alpha() требуют окна
+    screens = screen_sizes(args.screen)
+    targets = collect_targets(screens)
+    baked, reused, removed = bake(targets)
+    print(f"{BAKED_ASSETS_DIR}: {len(targets)} изображений (новых {baked}, без изменений {reused}, "
+          f"удалено {removed}); экраны: {', '.join(f'{w}x{h}' for w, h in screens)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Упаковка кадров hero_knight в один атлас.
+
+Запуск из корня проекта::
+
+    python -m tools.pack_atlas
+
+Берёт папки анимаций из ``_ANIM_INFO`` игрока и раскладывает кадры
+полками в ``atlas.png``.  Если все кадры одного размера и размер спрайта
+кратен ему, атлас хранится в исходном разрешении, а игрок масштабирует его
+целиком один раз (``scale`` в манифесте): маленький PNG декодируется
+быстрее, а ближайший сосед при целом множителе даёт те же пиксели, что и
+масштабирование каждого кадра.  Иначе кадры масштабируются заранее.
+
+Рядом пишется ``atlas.json``: для каждого состояния — папка и кадры
+(прямоугольник в атласе и исходный файл).  FPS и зацикленность анимаций
+в манифест не попадают: их задаёт ``_ANIM_INFO`` игрока.  После правки
+кадров атлас нужно пересобрать.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pygame as pg
+
+from models.player import _ANIM_INFO, ATLAS_MANIFEST, FRAME_SIZE, HERO_ASSETS
+
+ATLAS_MAX_WIDTH = 1024  # ширина полки атласа в пикселях
+
+
+def collect_frames(base_path: Path) -> dict[str, list[tuple[Path, pg.Surface]]]:
+    """Кадры каждого состояния в том же порядке, что и при загрузке из папок."""
+    return {
+        state.name: [(img_path, pg.image.load(img_path))
+                     for img_path in sorted((base_path / folder).glob("*.png"))]
+        for state, (folder, _, _) in _ANIM_INFO.items()
+    }
+
+
+def atlas_scale(frames: list[pg.Surface]) -> int:
+    """Целый множитель от кадров атласа до FRAME_SIZE; 1 — кадры масштабируются заранее."""
+    sizes = {surface.get_size() for surface in frames}
+    if len(sizes) != 1:
+        return 1
+    (w, h), = sizes
+    if FRAME_SIZE[0] % w or FRAME_SIZE[1] % h or FRAME_SIZE[0] // w != FRAME_SIZE[1] // h:
+        return 1
+    return FRAME_SIZE[0] // w
+
+
+def pack(sizes: list[tuple[int, int]], max_width: int) -> tuple[list[pg.Rect], tuple[int, int]]:
+    """Раскладывает прямоугольники полками слева направо; возвращает места и размер атласа."""
+    rects, x, y, shelf_h, width = [], 0, 0, 0, 0
+    for w, h in sizes:
+        if x and x + w > max_width:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        rects.append(pg.Rect(x, y, w, h))
+        x += w
+        shelf_h = max(shelf_h, h)
+        width = max(width, x)
+    return rects, (width, y + shelf_h)
+
+
+def build_atlas(base_path: Path = HERO_ASSETS, manifest_path: Path = ATLAS_MANIFEST) -> dict:
+    """Собирает атлас и манифест; возвращает манифест."""
+    frames = collect_frames(base_path)
+    flat = [surface for state_frames in frames.values() for _, surface in state_frames]
+    scale = atlas_scale(flat)
+    if scale == 1:
+        flat = [pg.transform.scale(surface, FRAME_SIZE) for surface in flat]
+    rects, size = pack([surface.get_size() for surface in flat], ATLAS_MAX_WIDTH)
+
+    atlas = pg.Surface(size, pg.SRCALPHA)
+    atlas.blits(list(zip(flat, rects)), doreturn=False)
+    image_path = manifest_path.with_suffix(".png")
+    pg.image.save(atlas, image_path)
+
+    rect_iter = iter(rects)
+    manifest = {
+        "image": image_path.name,
+        "frame_size": list(FRAME_SIZE),
+        "scale": scale,  # во сколько раз увеличить атлас при загрузке
+        "animations": {},
+    }
+    for state, (folder, _, _) in _ANIM_INFO.items():
+        manifest["animations"][state.name] = {
+            "folder": folder,
+            "frames": [
+                {
+                    "rect": list(next(rect_iter)),
+                    "source": img_path.relative_to(base_path).as_posix(),
+                }
+                for img_path, _ in frames[state.name]
+            ],
+        }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def main() -> int:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.init()
+    manifest = build_atlas()
+    count = sum(len(anim["frames"]) for anim in manifest["animations"].values())
+    print(f"Атлас {ATLAS_MANIFEST.with_suffix('.png')}: {count} кадров")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Сборка пакетов глав.
+
+Запуск из корня проекта::
+
+    python -m tools.pack_chapter [level_0 ...]
+
+Без аргументов собирает все папки ``assets/chapters/*``.  В пакет главы
+(``assets/chapters/<level_id>.pak``, формат — в ``models.asset_pack``)
+попадают:
+
+* файлы папки главы (``story.json``, TMX) и индекс сценария
+  (``models.script_index``) — реплики читаются из пакета по смещениям;
+* скомпилированный кэш каждого TMX (``.lvl``) и картинки его тайлсетов —
+  уровень читается из пакета без разбора XML;
+* сюжетные картинки, портреты и озвучка реплик, портрет по умолчанию.
+
+Для каждой записи сохраняются размер и время изменения исходников: игра
+берёт из пакета только то, что не менялось после сборки.  После правки
+ассетов пакет нужно пересобрать.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+from models.asset_pack import CHAPTERS_ROOT, PACK_SUFFIX, logical_path, write_pack
+from models.dialog import DialogModel
+from models.level import TILE_ASSETS_PATH
+from models.level_cache import CACHE_SUFFIX, level_sources, load_level
+from models.script_index import INDEX_SUFFIX, index_path
+from views.dialog_view import DEFAULT_PORTRAIT
+
+# Логический путь → (файл с данными, исходники для проверки свежести)
+PackFiles = dict[str, tuple[Path, list[Path]]]
+
+
+def chapter_files(chapter: Path) -> PackFiles:
+    """Всё, что читает глава: сценарий, уровни, картинки и звуки."""
+    files: PackFiles = {}
+
+    def add(path: str | Path, sources: list[Path] | None = None) -> None:
+        path = Path(path)
+        if path.is_file():
+            files[logical_path(path)] = (path, sources or [path])
+
+    for path in sorted(chapter.iterdir()):
+        if path.suffix not in (CACHE_SUFFIX, PACK_SUFFIX, INDEX_SUFFIX):
+            add(path)
+
+    # Уровни: кэш компилируется заранее, тайлсеты ищутся так же, как в Level
+    for tmx_path in sorted(chapter.glob("*.tmx")):
+        try:
+            level = load_level(tmx_path)
+            sources = level_sources(tmx_path)
+        except Exception as e:  # noqa: BLE001 — битый TMX не должен ронять сборку
+            print(f"Уровень {tmx_path} пропущен: {e}")
+            continue
+        add(tmx_path.with_suffix(CACHE_SUFFIX), sources)
+        for ref in level.tiles.values():
+            path = level.resolve(ref)
+            if not os.path.exists(path):
+                path = os.path.join(TILE_ASSETS_PATH, os.path.basename(path))
+            add(path)
+
+    try:
+        entries = DialogModel(f"{chapter.as_posix()}/").entries
+    except FileNotFoundError:
+        entries = []  # у главы нет сценария
+    if entries:
+        add(DEFAULT_PORTRAIT)
+    # Индекс строится при открытии сценария выше; устаревает вместе с ним
+    for script in (chapter / "story.json", chapter / "story.txt"):
+        add(index_path(script), [script])
+    for entry in entries:
+        for path in (entry.image, entry.sound, entry.portrait):
+            if path:
+                add(path)
+    return files
+
+
+def main(argv: list[str] | None = None) -> int:
+    level_ids = argv if argv is not None else sys.argv[1:]
+    chapters = [CHAPTERS_ROOT / level_id for level_id in level_ids] or sorted(
+        path for path in CHAPTERS_ROOT.iterdir() if path.is_dir()
+    )
+    for chapter in chapters:
+        if not chapter.is_dir():
+            print(f"Нет папки главы {chapter}")
+            return 1
+        files = chapter_files(chapter)
+        size = write_pack(chapter.with_suffix(PACK_SUFFIX), files)
+        print(f"{chapter.with_suffix(PACK_SUFFIX)}: {len(files)} файлов, {size / 1024:.0f} КБ")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 """Камера удерживает персонажа в геометрическом центре окна."""
 from __future__ import annotations
 
+import math
+
 import pygame as pg
 
 from models.constants import CAM_LERP
@@ -23,4 +25,22 @@ class Camera:
         self.pos += (desired - self.pos) * CAM_LERP
 
     def apply(self, spr: pg.sprite.Sprite) -> pg.Rect:
-        return spr.rect.move(-self.pos.x, -self.pos.y)
+        """Экранный прямоугольник картинки спрайта.
+
+        Если кадр обрезан до видимых пикселей, ``spr.image_offset`` задаёт его
+        сдвиг от ``rect.topleft``, а размер берётся у самой картинки.
+        """
+        offset = getattr(spr, "image_offset", None)
+        if offset is None:
+            return self.apply_rect(spr.rect)
+        rect = spr.image.get_rect(topleft=(spr.rect.x + offset[0], spr.rect.y + offset[1]))
+        return self.apply_rect(rect)
+
+    def apply_rect(self, rect: pg.Rect) -> pg.Rect:
+        """Переводит мировой прямоугольник в экранные координаты."""
+        return rect.move(-self.pos.x, -self.pos.y)
+
+    @property
+    def view_rect(self) -> pg.Rect:
+        """Видимая область мира в мировых координатах."""
+        return pg.Rect(math.floor(self.pos.x), math.floor(self.pos.y), self.scr_w, self.scr_h)
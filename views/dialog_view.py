@@ -2,8 +2,29 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from dataclasses import dataclass
+
 import pygame as pg
 from models.dialog import DialogModel, DialogueEntry
+from models.display_format import display_format
+from models.resources import resources
+
+# Портрет рассказчика по умолчанию и размер портретов
+DEFAULT_PORTRAIT = "assets/images/menu/storyteller.png"
+PORTRAIT_SIZE = (120, 120)
+SLIDE_CACHE = 3  # сколько собранных кадров реплик держать (текущая, следующая, прошлая)
+
+# Строка текста: поверхность, позиция на экране, X конца каждого символа
+_Line = tuple[pg.Surface, tuple[int, int], list[int]]
+
+
+@dataclass(frozen=True, slots=True)
+class _Slide:
+    """Собранный кадр реплики."""
+    background: pg.Surface  # всё неизменное: фон, затемнение, плашки, имя, портрет
+    lines: list[_Line]      # разложенный текст
+    chars: int              # сколько символов печатается
 
 
 class DialogView:
@@ -13,8 +34,8 @@ class DialogView:
         self.model = model
         self.screen = screen
         self.cfg = cfg
-        self.font = pg.font.Font(None, 32)
-        self.name_font = pg.font.Font(None, 36)
+        self.font = resources.font(None, 32)
+        self.name_font = resources.font(None, 36)
 
         # Настраиваем диалоговое окно внизу экрана
         screen_height = screen.get_height()
@@ -30,7 +51,7 @@ class DialogView:
                               200, 40)
         
         # Настраиваем область для портрета
-        self.portrait_size = (120, 120)
+        self.portrait_size = PORTRAIT_SIZE
         self.portrait_box = pg.Rect(30, screen_height - dialog_height - 10,
                                   self.portrait_size[0], self.portrait_size[1])
         
@@ -40,87 +61,163 @@ class DialogView:
         
         self._name_bg = pg.Surface(self.name_box.size, pg.SRCALPHA)
         self._name_bg.fill((50, 100, 50, 220))
+
+        # Собранные кадры реплик: индекс -> фон со всем неизменным и строки текста
+        self._slides: OrderedDict[int, _Slide] = OrderedDict()
+        self._slides_size = screen.get_size()  # при смене размера экрана кадры собираются заново
+        display_format.listen(self._drop_slides)
         
         # Загружаем изображение рассказчика по умолчанию
         try:
-            self.default_portrait = pg.image.load("assets/images/menu/storyteller.png").convert_alpha()
-            self.default_portrait = pg.transform.scale(self.default_portrait, self.portrait_size)
+            self.default_portrait = resources.image(DEFAULT_PORTRAIT, size=self.portrait_size)
         except FileNotFoundError:
             self.default_portrait = self._create_default_portrait()
 
-    # ---------------------------------------------------------------- draw
-    def draw(self, index: int) -> None:
+    # ---------------------------------------------------------------- public
+    def assets(self, index: int) -> list[tuple[str, bool, tuple[int, int]]]:
+        """Картинки реплики в тех размерах, в которых их рисует ``draw`` (для предзагрузки)."""
         entry: DialogueEntry = self.model.get(index)
+        images = []
+        if entry.image:
+            images.append((entry.image, True, self.screen.get_size()))
+        if entry.portrait:
+            images.append((entry.portrait, True, self.portrait_size))
+        return images
+
+    def prepare(self, index: int) -> None:
+        """Собирает кадр реплики заранее, чтобы переход на неё не ждал."""
+        self._slide(index)
+
+    # ---------------------------------------------------------------- draw
+    def draw(self, index: int, revealed: int | None = None) -> None:
+        """Рисует реплику; ``revealed`` — сколько символов текста показать (None — весь)."""
+        slide = self._slide(index)
+
+        # Фон, затемнение, плашки, имя и портрет собраны заранее — один непрозрачный блит
+        self.screen.blit(slide.background, (0, 0))
+
+        # Текст диалога: готовые строки, при печати — обрезанные по числу символов
+        left = slide.chars if revealed is None else revealed
+        for surface, pos, stops in slide.lines:
+            if left >= len(stops):
+                self.screen.blit(surface, pos)
+                left -= len(stops)
+                continue
+            if left > 0:
+                self.screen.blit(surface, pos, (0, 0, stops[left - 1], surface.get_height()))
+            break
+        else:
+            # Индикатор прокрутки — когда реплика показана целиком
+            self._draw_scroll_indicator()
+
+    def text_length(self, index: int) -> int:
+        """Сколько символов печатает реплика (для посимвольного появления)."""
+        return self._slide(index).chars
+
+    # ----------------------------------------------------------- internals
+    def _slide(self, index: int) -> _Slide:
+        """Кадр реплики: строится один раз, дальше берётся из кэша."""
+        if self._slides_size != self.screen.get_size():
+            self._slides.clear()
+            self._slides_size = self.screen.get_size()
+        slide = self._slides.get(index)
+        if slide is not None:
+            self._slides.move_to_end(index)
+            return slide
 
-        # Рисуем фоновое изображение на весь экран (если есть)
+        entry: DialogueEntry = self.model.get(index)
+        background = pg.Surface(self.screen.get_size()).convert()
+        # Рисуем фоновое изображение на весь экран (если есть), иначе темный фон
+        background.fill((0, 0, 0))
         if entry.image:
             try:
-                img = pg.image.load(entry.image).convert_alpha()
-                img = pg.transform.scale(img, self.screen.get_size())
-                self.screen.blit(img, (0, 0))
+                background.blit(resources.image(entry.image, size=self.screen.get_size()), (0, 0))
             except (pg.error, FileNotFoundError):
-                # Если изображение не загрузилось, рисуем темный фон
-                self.screen.fill((0, 0, 0))
-        else:
-            # Если изображения нет, просто рисуем темный фон
-            self.screen.fill((0, 0, 0))
-
+                pass
         # Легкое затемнение всего экрана для лучшей видимости текста
-        dim = pg.Surface(self.screen.get_size(), pg.SRCALPHA)
+        dim = pg.Surface(background.get_size(), pg.SRCALPHA)
         dim.fill((0, 0, 0, 100))
-        self.screen.blit(dim, (0, 0))
+        background.blit(dim, (0, 0))
 
-        # Отрисовка имени говорящего
-        self.screen.blit(self._name_bg, self.name_box.topleft)
-        speaker_name = entry.speaker if hasattr(entry, 'speaker') and entry.speaker else "Рассказчик"
+        # Имя говорящего на плашке
+        background.blit(self._name_bg, self.name_box.topleft)
+        speaker_name = entry.speaker or "Рассказчик"
         name_text = self.name_font.render(speaker_name, True, (255, 255, 255))
-        name_rect = name_text.get_rect(center=self.name_box.center)
-        self.screen.blit(name_text, name_rect)
+        background.blit(name_text, name_text.get_rect(center=self.name_box.center))
 
-        # Отрисовка текстового окна диалога
-        self.screen.blit(self._box_bg, self.text_box.topleft)
-        
-        # Отрисовка портрета говорящего
-        portrait = None
-        if hasattr(entry, 'portrait') and entry.portrait:
+        # Текстовое окно и портрет говорящего
+        background.blit(self._box_bg, self.text_box.topleft)
+        portrait = self.default_portrait
+        if entry.portrait:
             try:
-                portrait = pg.image.load(entry.portrait).convert_alpha()
-                portrait = pg.transform.scale(portrait, self.portrait_size)
+                portrait = resources.image(entry.portrait, size=self.portrait_size)
             except (pg.error, FileNotFoundError):
-                portrait = self.default_portrait
-        else:
-            portrait = self.default_portrait
-            
-        self.screen.blit(portrait, self.portrait_box.topleft)
-        
-        # Отрисовка текста диалога (с учетом отступа для портрета)
+                pass
+        background.blit(portrait, self.portrait_box.topleft)
+
+        # Текст диалога (с учетом отступа для портрета)
         text_area = pg.Rect(
-            self.portrait_box.right + 20, 
+            self.portrait_box.right + 20,
             self.text_box.top + 20,
-            self.text_box.width - self.portrait_size[0] - 40, 
+            self.text_box.width - self.portrait_size[0] - 40,
             self.text_box.height - 40
         )
-        self._render_text(entry.text, text_area)
-        
-        # Отрисовка индикатора прокрутки
-        self._draw_scroll_indicator()
+        lines = self._layout_text(entry.text, text_area)
 
-    # ----------------------------------------------------------- internals
-    def _render_text(self, text: str, rect: pg.Rect) -> None:
-        """Простейшая раскладка слов по строкам внутри прямоугольника."""
-        words = text.split()
+        self._slides[index] = slide = _Slide(background, lines, sum(len(stops) for _, _, stops in lines))
+        while len(self._slides) > SLIDE_CACHE:
+            self._slides.popitem(last=False)
+        return slide
+
+    def _drop_slides(self) -> None:
+        """Собранные кадры — в старом формате окна; соберутся заново."""
+        self._slides.clear()
+
+    def _layout_text(self, text: str, rect: pg.Rect) -> list[_Line]:
+        """Простейшая раскладка слов по строкам внутри прямоугольника.
+
+        Каждая строка собирается в одну поверхность; для печати запоминается,
+        где по X кончается каждый её символ (пробелы между словами — тоже).
+        """
+        lines: list[_Line] = []
         space = self.font.size(" ")[0]
         x, y = rect.topleft
-        max_w = rect.width
-        for word in words:
+        words: list[tuple[pg.Surface, int]] = []  # слова текущей строки и их X
+        stops: list[int] = []
+
+        def flush() -> None:
+            if not words:
+                return
+            x0 = words[0][1]
+            last, last_x = words[-1]
+            height = max(surf.get_height() for surf, _ in words)  # у слов с хвостами букв она больше
+            line = pg.Surface((last_x + last.get_width() - x0, height), pg.SRCALPHA)
+            for surf, wx in words:
+                # Слова не пересекаются: MAX по прозрачному фону — точная копия пикселей
+                line.blit(surf, (wx - x0, 0), special_flags=pg.BLEND_RGBA_MAX)
+            lines.append((line, (x0, line_y), [stop - x0 for stop in stops]))
+            words.clear()
+            stops.clear()
+
+        line_y = y
+        for word in text.split():
             surf = self.font.render(word, True, (255, 255, 255))
             w, h = surf.get_size()
             if x + w >= rect.right:
+                flush()
                 x = rect.left
                 y += h
-            self.screen.blit(surf, (x, y))
+            if not words:
+                line_y = y
+            else:
+                stops.append(x)  # пробел перед словом
+            words.append((surf, x))
+            stops.extend(x + self.font.size(word[:k])[0] for k in range(1, len(word)))
+            stops.append(x + w)
             x += w + space
-            
+        flush()
+        return lines
+
     def _draw_scroll_indicator(self) -> None:
         """Рисует индикатор прокрутки (стрелка вниз) в нижней части диалогового окна."""
         # Рисуем треугольник как индикатор прокрутки
@@ -3,6 +3,21 @@ from __future__ import annotations
 
 import pygame as pg
 from models.player import Player
+from models.resources import resources
+from models.display_format import display_format
+
+# Картинки HUD (их же заранее грузит экран загрузки)
+HUD_IMAGES = {
+    "portrait": "assets/images/hud/portrait.png",
+    "heart_full": "assets/images/hud/heart_full.png",
+    "heart_empty": "assets/images/hud/heart_empty.png",
+    "coin": "assets/images/hud/coin.png",
+    "mana": "assets/images/hud/mana.png",
+}
+# Размеры элементов HUD (по ним же tools.bake_assets масштабирует картинки заранее)
+PORTRAIT_SIZE = (64, 64)
+HEART_SIZE = (24, 24)
+ICON_SIZE = (24, 24)
 
 
 class HUD:
@@ -11,31 +26,17 @@ class HUD:
     def __init__(self, screen: pg.Surface):
         self.screen = screen
         
-        # Загружаем изображения для HUD
-        try:
-            self.portrait = pg.image.load("assets/images/hud/portrait.png").convert_alpha()
-            self.heart_full = pg.image.load("assets/images/hud/heart_full.png").convert_alpha()
-            self.heart_empty = pg.image.load("assets/images/hud/heart_empty.png").convert_alpha()
-            self.coin_img = pg.image.load("assets/images/hud/coin.png").convert_alpha()
-            self.mana_img = pg.image.load("assets/images/hud/mana.png").convert_alpha()
-        except FileNotFoundError:
-            # Создаем заглушки, если файлы не найдены
-            self._create_placeholder_images()
-        
         # Размеры элементов HUD
-        self.portrait_size = (64, 64)
-        self.heart_size = (24, 24)
-        self.icon_size = (24, 24)
-        
-        # Масштабируем изображения
-        self.portrait = pg.transform.scale(self.portrait, self.portrait_size)
-        self.heart_full = pg.transform.scale(self.heart_full, self.heart_size)
-        self.heart_empty = pg.transform.scale(self.heart_empty, self.heart_size)
-        self.coin_img = pg.transform.scale(self.coin_img, self.icon_size)
-        self.mana_img = pg.transform.scale(self.mana_img, self.icon_size)
+        self.portrait_size = PORTRAIT_SIZE
+        self.heart_size = HEART_SIZE
+        self.icon_size = ICON_SIZE
+
+        self._load_images()
+        # После смены видеорежима берём из кэша переконвертированные картинки
+        display_format.listen(self._load_images)
         
         # Задаем шрифт для отображения текста
-        self.font = pg.font.Font(None, 24)
+        self.font = resources.font(None, 24)
         
         # Настройки отображения
         self.padding = 50  # Увеличенный отступ от края экрана
@@ -47,7 +48,25 @@ class HUD:
         # Настройки для панели скиллов
         self.skill_slot_size = 64  # Размер слота скилла
         self.skill_slot_spacing = 10  # Расстояние между слотами
-        self.skill_font = pg.font.Font(None, 20)  # Шрифт для отображения клавиш
+        self.skill_font = resources.font(None, 20)  # Шрифт для отображения клавиш
+
+    def _load_images(self) -> None:
+        """Загружает изображения для HUD сразу в нужном размере (через общий кэш)."""
+        try:
+            self.portrait = resources.image(HUD_IMAGES["portrait"], size=self.portrait_size)
+            self.heart_full = resources.image(HUD_IMAGES["heart_full"], size=self.heart_size)
+            self.heart_empty = resources.image(HUD_IMAGES["heart_empty"], size=self.heart_size)
+            self.coin_img = resources.image(HUD_IMAGES["coin"], size=self.icon_size)
+            self.mana_img = resources.image(HUD_IMAGES["mana"], size=self.icon_size)
+        except FileNotFoundError:
+            # Создаем заглушки, если файлы не найдены
+            self._create_placeholder_images()
+            # Масштабируем изображения
+            self.portrait = pg.transform.scale(self.portrait, self.portrait_size)
+            self.heart_full = pg.transform.scale(self.heart_full, self.heart_size)
+            self.heart_empty = pg.transform.scale(self.heart_empty, self.heart_size)
+            self.coin_img = pg.transform.scale(self.coin_img, self.icon_size)
+            self.mana_img = pg.transform.scale(self.mana_img, self.icon_size)
 
     def update_screen(self, screen: pg.Surface):
         """Обновляет ссылку на экран."""
@@ -0,0 +1,37 @@
+"""Экран загрузки: надпись и полоса прогресса."""
+from __future__ import annotations
+
+import pygame as pg
+
+from models.constants import BG_COLOR
+from models.resources import resources
+
+
+class LoadingView:
+    """Рисует прогресс предзагрузки по центру экрана."""
+
+    def __init__(self, screen: pg.Surface):
+        self.screen = screen
+        self.font = resources.font(None, 48)
+        self.bar_size = (480, 24)
+
+    def update_screen(self, screen: pg.Surface) -> None:
+        """Обновляет ссылку на экран (всё считается в draw)."""
+        self.screen = screen
+
+    def draw(self, progress: float) -> None:
+        self.screen.fill(BG_COLOR)
+        cx, cy = self.screen.get_width() // 2, self.screen.get_height() // 2
+
+        text = self.font.render(f"Загрузка… {int(progress * 100)}%", True, (230, 230, 230))
+        self.screen.blit(text, text.get_rect(midbottom=(cx, cy - 16)))
+
+        bar = pg.Rect(0, 0, *self.bar_size)
+        bar.center = (cx, cy + self.bar_size[1] // 2)
+        pg.draw.rect(self.screen, (40, 40, 40), bar, border_radius=6)
+        fill = bar.inflate(-6, -6)
+        fill.width = int(fill.width * progress)
+        if fill.width:
+            pg.draw.rect(self.screen, (200, 170, 90), fill, border_radius=4)
+        pg.draw.rect(self.screen, (120, 120, 120), bar, 2, border_radius=6)
+        pg.display.flip()
@@ -6,6 +6,9 @@ from typing import List, Tuple
 
 import pygame as pg
 
+from models.resources import resources
+from models.display_format import display_format
+
 BG_IMAGES = [
     "assets/images/menu/bg1.png",
     "assets/images/menu/bg2.png",
@@ -24,11 +27,12 @@ class MenuView:
 
     def __init__(self, screen: pg.Surface, cfg, items: List[Tuple[str, bool]]):
         self.screen, self.cfg = screen, cfg
-        self.font = pg.font.SysFont(None, 60)
-        self.original_images = [pg.image.load(p).convert() for p in BG_IMAGES]
-        self.bgs = [pg.transform.scale(img, screen.get_size()) for img in self.original_images]
+        self.font = resources.sysfont(None, 60)
+        self.original_images = [resources.image(p, alpha=False) for p in BG_IMAGES]
+        self.bgs = [resources.image(p, size=screen.get_size(), alpha=False) for p in BG_IMAGES]
         self.idx = random.randrange(len(self.bgs))
         self.current_bg = self.bgs[self.idx]
+        display_format.listen(self._reload_backgrounds)
         self._play_music(self.idx)
 
         self.fade, self.next_bg, self.next_idx = False, None, None
@@ -56,6 +60,16 @@ class MenuView:
         pg.mixer.music.play()
         pg.mixer.music.set_endevent(MUSIC_END_EVENT)
 
+    def _reload_backgrounds(self) -> None:
+        """Берёт из кэша фоны, переконвертированные под новый видеорежим."""
+        self.original_images = [resources.image(p, alpha=False) for p in BG_IMAGES]
+        self.bgs = [resources.image(p, size=self.screen.get_size(), alpha=False) for p in BG_IMAGES]
+        self.current_bg = self.bgs[self.idx]
+        if self.fade and self.next_bg:
+            alpha = self.next_bg.get_alpha()
+            self.next_bg = self.bgs[self.next_idx].copy()
+            self.next_bg.set_alpha(alpha)
+
     # ---------------------------------------------------------------- fade
     def start_fade(self) -> None:
         nxt = (self.idx + random.randint(1, len(self.bgs) - 1)) % len(self.bgs)
@@ -93,7 +107,7 @@ class MenuView:
             
         self.screen = screen
         # Пересоздаем масштабированные фоны
-        self.bgs = [pg.transform.scale(img, screen.get_size()) for img in self.original_images]
+        self.bgs = [resources.image(p, size=screen.get_size(), alpha=False) for p in BG_IMAGES]
         self.current_bg = self.bgs[self.idx]
         
         # Если у нас активен переход, обновляем и его
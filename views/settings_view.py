@@ -33,6 +33,8 @@ class SettingsView:
             return f"{text}: {mode}"
         if ident == "volume":
             return f"{text}: {int(self.cfg.music_volume * 100)}%"
+        if ident == "typewriter":
+            return f"{text}: {'ON' if self.cfg.typewriter else 'OFF'}"
         return text
 
     def _rect(self, y: int, txt: str) -> pg.Rect: